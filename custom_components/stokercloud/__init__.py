@@ -1,9 +1,20 @@
 from __future__ import annotations
-from homeassistant.config_entries import ConfigEntry
+import logging
+import time
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.core import HomeAssistant
 from homeassistant.const import Platform
-from .const import DOMAIN
+from homeassistant.helpers import entity_registry as er
+from .const import DOMAIN, CONF_SERIAL, DATA_FLEET, FLEET_MAX_CONCURRENT_REQUESTS
 from .api import StokerCloudWriteApi
+from .client import async_close_session
+from .coordinator import StokerCloudCoordinator
+from .snapshot_store import SnapshotStore
+from .fields import fields_for_entities
+from .fleet import StokerCloudFleet
+from .outbox import async_remove_commands
+from .services import async_register_services, async_unregister_services
 
 from . import number as _preload_number  # noqa: F401
 from . import switch as _preload_switch  # noqa: F401
@@ -12,15 +23,64 @@ from . import binary_sensor as _preload_binary_sensor  # noqa: F40
 
 PLATFORMS: list[Platform] = [Platform.NUMBER, Platform.SWITCH, Platform.SENSOR, Platform.BINARY_SENSOR]
 
+_LOGGER = logging.getLogger(__name__)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    started = time.monotonic()
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = StokerCloudWriteApi(hass, entry)
+    # Staggered polls and a shared request limit across all boilers.
+    if (fleet := hass.data[DOMAIN].get(DATA_FLEET)) is None:
+        fleet = hass.data[DOMAIN][DATA_FLEET] = StokerCloudFleet(FLEET_MAX_CONCURRENT_REQUESTS)
+    # One fetch of controllerdata2.php per cycle, shared by every platform.
+    api = StokerCloudWriteApi(hass, entry, fields_for_entities(_enabled_entity_suffixes(hass, entry)), fleet)
+    coordinator = StokerCloudCoordinator(hass, entry, api, fleet)
+    # Do not drop writes still inside their debounce window, nor ones waiting for a retry.
+    entry.async_on_unload(api.async_shutdown)
+    entry.async_on_unload(coordinator.store.async_flush)
+    # Options (polling, cache, deadbands, ...) are read at setup, so apply changes by reloading.
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+    # Values from before the restart, so entities are not unknown while the cloud answers.
+    await coordinator.async_restore_snapshot()
+    # Writes queued before the restart go out once the cloud answers.
+    await api.outbox.async_load()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_register_services(hass)
+
+    # Do not hold up Home Assistant startup on the cloud: entities are registered
+    # already and fill in when the first payload arrives.
+    entry.async_create_background_task(
+        hass, coordinator.async_initial_refresh(started), f"{DOMAIN}_initial_refresh"
+    )
+    coordinator.setup_seconds = time.monotonic() - started
+    _LOGGER.debug("%s: setup took %.3f s", entry.title, coordinator.setup_seconds)
     return True
 
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+
+def _enabled_entity_suffixes(hass: HomeAssistant, entry: ConfigEntry) -> set[str] | None:
+    """unique_id suffixes of the enabled entities; None on first setup (nothing registered yet)."""
+    entries = er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    if not entries:
+        return None
+    prefix = f"{entry.data.get(CONF_SERIAL, 'unknown')}_"
+    # Enabling or disabling an entity reloads the entry, so the screen is rebuilt then.
+    return {e.unique_id.removeprefix(prefix) for e in entries if e.disabled_by is None}
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        if not any(
+            e.state is ConfigEntryState.LOADED and e.entry_id != entry.entry_id
+            for e in hass.config_entries.async_entries(DOMAIN)
+        ):
+            async_unregister_services(hass)
+            await async_close_session(hass)
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await SnapshotStore(hass, entry.entry_id).async_remove()
+    await async_remove_commands(hass, entry.entry_id)
@@ -1,406 +1,431 @@
 from __future__ import annotations
-from aiohttp import ClientSession
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import asyncio
+import logging
+import time
+import zlib
+from contextlib import nullcontext
+from datetime import datetime, timezone
+
+from aiohttp import ClientError, ClientSession, hdrs
 from yarl import URL
 from .const import (
     UPDATE_URL, CONTROLLERDATA_URL, CONF_TOKEN,
     MISC_START_NAME, MISC_STOP_NAME, MISC_CMD_VALUE,
-    DEFAULT_SCREEN_QUERY, 
+    CONF_CACHE_TTL, CONF_MAX_STALE, DEFAULT_CACHE_TTL, DEFAULT_MAX_STALE,
+    CONF_WRITE_DEBOUNCE, DEFAULT_WRITE_DEBOUNCE, CONF_DEDICATED_SESSION, WRITE_MAX_CONCURRENT,
+    READ_TIMEOUT, WRITE_TIMEOUT, TIER_INTERVALS,
 )
+from .breaker import CircuitBreaker, is_outage
+from .client import decompress, get_session
+from .decoder import JsonDecoder
+from .fields import build_snapshot, build_tier_queries, fields_for_entities
+from .fleet import StokerCloudFleet
+from .outbox import CommandOutbox
+from .profiling import get_profiler
+from .snapshot import ControllerSnapshot
+from .telemetry import RequestTelemetry
+from .write_queue import WriteQueue
+
+_LOGGER = logging.getLogger(__name__)
+
 
 class StokerCloudWriteApi:
-    def __init__(self, hass, entry):
+    def __init__(self, hass, entry, fields: set[str] | None = None, fleet: StokerCloudFleet | None = None):
         self._hass = hass
         self._entry = entry
-        self._session: ClientSession = async_get_clientsession(hass)
+        # Shared concurrency limit for requests to stokercloud.dk across all entries.
+        self._fleet = fleet
+        # Optional dedicated keep-alive pool that leaves decompression to _request_controller_json.
+        self._dedicated = bool(entry.options.get(CONF_DEDICATED_SESSION, False))
+        self._session: ClientSession = get_session(hass, self._dedicated)
+        # Request URLs, built once per screen / write name.
+        self._urls: dict[tuple[str, ...], URL] = {}
+        # Single-flight: identical GETs in progress, keyed by (screen, token).
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+        # Cycle deadline (loop time) each in-flight request was started with.
+        self._inflight_deadlines: dict[tuple[str, str], float] = {}
+        self.requests_sent = 0
+        self.requests_coalesced = 0
+        # Last good payload per (screen, token): (monotonic time, wall time, payload).
+        self._cache: dict[tuple[str, str], tuple[float, datetime, dict]] = {}
+        self._cache_ttl = float(entry.options.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL))
+        self._max_stale = float(entry.options.get(CONF_MAX_STALE, DEFAULT_MAX_STALE))
+        # Screens with only the slots the enabled entities read (see fields.SCREEN_SLOTS), one per
+        # cadence tier. The fast one is fetched every poll; slower ones once per tier interval.
+        (_fast, self.screen, self._selections), *slower = build_tier_queries(
+            fields if fields is not None else fields_for_entities(None)
+        )
+        # (tier, screen, interval) of the slower tiers.
+        self.tier_screens: list[tuple[str, str, float]] = []
+        for tier, screen, selections in slower:
+            self.tier_screens.append((tier, screen, max(self._cache_ttl, TIER_INTERVALS[tier])))
+            self._selections = {**self._selections, **selections}
+        # Screens whose latest request failed: their cached payload is being served stale.
+        self._failed: set[tuple[str, str]] = set()
+        self.cache_hits = 0
+        self.cache_stale_hits = 0
+        # Latency, size and failures by cause of controllerdata2.php reads and updatevalue.php writes.
+        self.read_stats = RequestTelemetry()
+        self.write_stats = RequestTelemetry()
+        # Fails fast while stokercloud.dk is down, probing recovery with single requests.
+        self.breaker = CircuitBreaker()
+        self.requests_short_circuited = 0
+        # orjson when available; large or slow bodies are decoded off the event loop.
+        self.decoder = JsonDecoder(hass)
+        # Timing spans, recorded only while stokercloud.start_profiling is active.
+        self.profiler = get_profiler(hass)
+        # Debounced writes to this boiler, serialized per parameter (see async_submit_write).
+        self.writes = WriteQueue(
+            self._async_write,
+            float(entry.options.get(CONF_WRITE_DEBOUNCE, DEFAULT_WRITE_DEBOUNCE)),
+            WRITE_MAX_CONCURRENT,
+        )
+        # Writes lost to an outage, retried until they reach the boiler (see _async_write).
+        self.outbox = CommandOutbox(hass, entry.entry_id, entry.title, self._async_retry_write)
+        # Cause of the last failed _post (None after a success), read right after it returns.
+        self._last_write_error: str | None = None
 
-    async def async_set_boiler_setpoint(self, value: int) -> bool:
-        url = URL(UPDATE_URL).with_query({
-            "menu": "boiler.temp",
-            "name": "boiler.temp",
-            "token": self._entry.data[CONF_TOKEN],
-        })
-        data = {"value": str(value)}
-        try:
-            async with self._session.post(str(url), data=data, timeout=15) as resp:
-                return resp.status == 200
-        except Exception:
-            return False
+    def selection(self, key: str) -> str | None:
+        """Slot the screen query placed a value in (e.g. "hopper1"); None when it is not requested."""
+        return self._selections.get(key)
 
-    async def async_set_power(self, turn_on: bool) -> bool:
-        name = MISC_START_NAME if turn_on else MISC_STOP_NAME
-        url = URL(UPDATE_URL).with_query({"name": name, "token": self._entry.data[CONF_TOKEN]})
-        try:
-            async with self._session.post(str(url), data={"value": MISC_CMD_VALUE}, timeout=10) as resp:
-                return resp.status == 200
-        except Exception:
-            return False
+    async def async_submit_write(self, name: str, value, debounce: float | None = None) -> bool:
+        """
+        Queue a write ("boiler.temp", "hopper.content", "hot_water.diff_under", "misc.power"
+        with True/False, or any other updatevalue.php name). Bursts collapse to the latest value;
+        returns whether it was accepted.
+        """
+        return await self.writes.async_submit(name, value, debounce)
 
-    async def _fetch_controller_json(self) -> dict | None:
-        """Get JSON from controllerdata2.php."""
-        url = URL(CONTROLLERDATA_URL).with_query({
-            "screen": DEFAULT_SCREEN_QUERY,
-            "token": self._entry.data[CONF_TOKEN],
-        })
-        try:
-            async with self._session.get(str(url), timeout=15) as resp:
-                if resp.status != 200:
-                    return None
-                return await resp.json(content_type=None)
-        except Exception:
-            return None
+    async def _async_write(self, name: str, value) -> bool:
+        self._last_write_error = None
+        with self.profiler.span(f"write:{name}"):
+            ok = await self._async_send_write(name, value)
+        if ok:
+            self.outbox.discard(name)
+        elif (cause := self._last_write_error) is not None and (cause == "short_circuit" or is_outage(cause)):
+            # The cloud did not get it: retry once it is back.
+            self.outbox.add(name, value, sent=cause != "short_circuit")
+        else:
+            # Rejected (HTTP 4xx) or not sendable: retrying would only repeat the answer.
+            self.outbox.discard(name)
+        return ok
 
-    async def async_get_boiler_temperature_from_controller(self) -> float | None:
-        """frontdata['boilertemp'] → °C"""
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
-        try:
-            for item in data.get("frontdata", []):
-                if str(item.get("id")) == "boilertemp":
-                    return float(str(item.get("value")).replace(",", "."))
-        except Exception:
-            pass
-        # Fallback (sometimes equal to the actual temperature):
-        try:
-            wc = data.get("weathercomp") or {}
-            val = wc.get("zone1-actual", {}).get("val")
-            if val is not None:
-                return float(str(val).replace(",", "."))
-        except Exception:
-            pass
-        return None
+    def write_queued(self, name: str) -> bool:
+        """A failed write of this parameter is waiting in the outbox for the cloud to come back."""
+        return name in self.outbox.commands
 
-    async def async_get_external_temperature_from_controller(self) -> float | None:
-        """weatherdata[id=='7'] → outdoor temperature, °C."""
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
-        try:
-            for item in data.get("weatherdata", []):
-                if str(item.get("id")) == "7":  # lng_weather_7
-                    return float(str(item.get("value")).replace(",", "."))
-        except Exception:
-            pass
-        # Fallback: sometimes found in weathercomp.zone1-actualref.val
-        try:
-            wc = data.get("weathercomp") or {}
-            val = wc.get("zone1-actualref", {}).get("val")
-            if val is not None:
-                return float(str(val).replace(",", "."))
-        except Exception:
-            pass
-        return None
+    async def _async_retry_write(self, name: str, value) -> bool:
+        return await self.writes.async_submit(name, value, debounce=0.0)
 
-    async def async_get_wanted_boiler_temp_from_controller(self) -> float | None:
-        """frontdata['-wantedboilertemp'] → °C."""
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
-        try:
-            for item in data.get("frontdata", []):
-                if str(item.get("id")) == "-wantedboilertemp":
-                    return float(str(item.get("value")).replace(",", "."))
-        except Exception:
-            pass
-        return None
+    async def async_shutdown(self) -> None:
+        """Send writes still in their debounce window, then persist what could not be delivered."""
+        await self.writes.async_flush_all()
+        await self.outbox.async_shutdown()
 
-    async def async_get_dhw_temperature_from_controller(self) -> float | None:
-        """frontdata['dhw'] → °C."""
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
-        try:
-            for item in data.get("frontdata", []):
-                if str(item.get("id")) == "dhw":
-                    return float(str(item.get("value")).replace(",", "."))
-        except Exception:
-            pass
-        return None
+    async def _async_send_write(self, name: str, value) -> bool:
+        if name == "boiler.temp":
+            return await self.async_set_boiler_setpoint(int(round(value)))
+        if name == "hopper.content":
+            return await self.async_set_hopper_content_kg(value)
+        if name == "hot_water.diff_under":
+            return await self.async_set_dhw_diff_under_temp(value)
+        if name == "misc.power":
+            return await self.async_set_power(bool(value))
+        return await self.async_set_parameter(name, value)
 
-    async def async_get_dhw_wanted_temperature_from_controller(self) -> float | None:
-        """frontdata['dhwwanted'] → °C."""
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
-        try:
-            for item in data.get("frontdata", []):
-                if str(item.get("id")) == "dhwwanted":
-                    return float(str(item.get("value")).replace(",", "."))
-        except Exception:
-            pass
-        return None
+    async def async_set_boiler_setpoint(self, value: int) -> bool:
+        return await self._post(self._write_url("boiler.temp", "boiler.temp"), {"value": str(value)})
 
-    async def async_get_dhw_difference_under_from_controller(self) -> float | None:
-        """dhwdata[id=='3'] → °C."""
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
-        try:
-            for item in data.get("dhwdata", []):
-                if str(item.get("id")) == "3":  # lng_dhw_3
-                    return float(str(item.get("value")).replace(",", "."))
-        except Exception:
-            pass
-        return None
+    async def async_set_power(self, turn_on: bool) -> bool:
+        name = MISC_START_NAME if turn_on else MISC_STOP_NAME
+        return await self._post(self._write_url(name), {"value": MISC_CMD_VALUE})
 
-    async def async_set_dhw_diff_under_temp(self, value_c: float) -> None:
-        """dhwdata[id=='3'] → °C."""
+    async def async_set_parameter(self, name: str, value) -> bool:
+        """Any other updatevalue.php parameter, sent like boiler.temp (menu and name in the query)."""
+        if isinstance(value, bool):
+            value = int(value)
+        elif isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return await self._post(self._write_url(name, name), {"value": str(value)})
 
-        token = self._entry.data.get(CONF_TOKEN)
-        if not token:
-            return
+    def _write_url(self, name: str, menu: str | None = None) -> URL:
+        key = ("write", name, menu or "")
+        if (url := self._urls.get(key)) is None:
+            query = {"menu": menu, "name": name} if menu else {"name": name}
+            url = self._urls[key] = URL(UPDATE_URL).with_query({**query, "token": self._entry.data[CONF_TOKEN]})
+        return url
 
-        payload = {
-            "menu": "hot_water.diff_under",
-            "name": "hot_water.diff_under",
-            "token": token,
-            "value": f"{float(value_c):.1f}",
-        }
-        try:
-            async with self._session.post(UPDATE_URL, data=payload, timeout=10):
-                pass
-        except Exception:
-            return
-
-    async def async_get_shaft_temperature_from_controller(self) -> float | None:
-        """boilerdata[id=='7'] (lng_boil_7) → °C."""
-        data = await self._fetch_controller_json()
-        val = None
-        try:
-            for item in (data or {}).get("boilerdata", []):
-                if str(item.get("id")) == "7":
-                    val = float(str(item.get("value")).replace(",", "."))
-                    break
-        except Exception:
-            val = None
-
-        if val is not None:
-            return val
-
-        # Fallback: if the main screen did not receive id=7, we fetch it separately.
-        from yarl import URL
-        try:
-            url = URL(CONTROLLERDATA_URL).with_query({
-                "screen": "b1,7",
+    def _read_url(self, screen: str) -> URL:
+        key = ("read", screen)
+        if (url := self._urls.get(key)) is None:
+            url = self._urls[key] = URL(CONTROLLERDATA_URL).with_query({
+                "screen": screen,
                 "token": self._entry.data[CONF_TOKEN],
             })
-            async with self._session.get(str(url), timeout=10) as resp:
-                if resp.status != 200:
-                    return None
-                data2 = await resp.json(content_type=None)
-                for item in (data2 or {}).get("boilerdata", []):
-                    if str(item.get("id")) == "7":
-                        return float(str(item.get("value")).replace(",", "."))
-        except Exception:
-            return None
+        return url
 
-        return None
+    def _request_slot(self):
+        if self._fleet is None:
+            return nullcontext()
+        return self._fleet.request_slot(self._entry.entry_id)
 
-    async def async_get_boiler_running_from_controller(self) -> bool | None:
-        """miscdata.running → True/False."""
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
-        try:
-            running = (data.get("miscdata") or {}).get("running")
-            # We treat 1 / "1" / True as ON.
-            if running is None:
-                return None
-            s = str(running).strip().lower()
-            if s in ("1", "true", "on", "yes"):
-                return True
-            if s in ("0", "false", "off", "no"):
+    async def _post(self, url: str | URL, data: dict, timeout: float = WRITE_TIMEOUT) -> bool:
+        """POST to updatevalue.php; True when the controller accepted the value."""
+        with self.breaker.attempt() as allowed:
+            if not allowed:
+                self.requests_short_circuited += 1
+                self._last_write_error = "short_circuit"
+                _LOGGER.warning("%s: stokercloud.dk is unreachable, write not sent", self._entry.title)
                 return False
-            # if it’s a number/float, we treat values > 0 as True
-            try:
-                return float(s) > 0
-            except Exception:
-                return None
-        except Exception:
-            return None
+            return await self._send_post(url, data, timeout)
 
-    async def async_get_output_kw_from_controller(self) -> float | None:
-        """miscdata.output → кіловати (kW)."""
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
+    async def _send_post(self, url: str | URL, data: dict, timeout: float) -> bool:
+        started = time.monotonic()
         try:
-            val = (data.get("miscdata") or {}).get("output")
-            if val is None:
-                return None
-            return float(str(val).replace(",", "."))
-        except Exception:
-            return None
+            with self.profiler.span("write_network_io"):
+                async with self._request_slot(), self._session.post(url, data=data, timeout=timeout) as resp:
+                    status = resp.status
+        except (asyncio.TimeoutError, ClientError) as err:
+            cause = self._last_write_error = "timeout" if isinstance(err, asyncio.TimeoutError) else "connection"
+            self.write_stats.record_failure(cause, time.monotonic() - started, repr(err))
+            self.breaker.record_failure()
+            _LOGGER.warning("%s: write to updatevalue.php failed (%s): %r", self._entry.title, cause, err)
+            return False
+        if status != 200:
+            self._last_write_error = f"http_{status}"
+            self.write_stats.record_failure(f"http_{status}", time.monotonic() - started)
+            if is_outage(f"http_{status}"):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            _LOGGER.warning("%s: updatevalue.php answered HTTP %s", self._entry.title, status)
+            return False
+        self._last_write_error = None
+        self.write_stats.record_success(time.monotonic() - started)
+        self.breaker.record_success()
+        # After a write the cached payloads no longer reflect the controller.
+        self._cache.clear()
+        return True
 
-    async def async_get_output_pct_from_controller(self) -> float | None:
-        """miscdata.outputpct → відсотки (%)."""
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
-        try:
-            val = (data.get("miscdata") or {}).get("outputpct")
-            if val is None:
-                return None
-            return float(str(val).replace(",", "."))
-        except Exception:
-            return None
+    async def _fetch_controller_json(
+        self, screen: str | None = None, deadline: float | None = None, fresh: bool = False
+    ) -> dict | None:
+        """
+        Get JSON from controllerdata2.php.
+        Payloads younger than the cache TTL come from memory; older ones are fetched again
+        within the poll cycle. When that fails, a payload up to max_stale old is returned
+        instead (the snapshot is marked stale). fresh=True skips the cache.
+        deadline (loop time) bounds the request; every request of one poll cycle shares it.
+        """
+        screen = screen or self.screen
+        key = (screen, self._entry.data[CONF_TOKEN])
+        cached = self._cache.get(key)
+        if cached is not None and not fresh and time.monotonic() - cached[0] < self._cache_ttl:
+            self.cache_hits += 1
+            return cached[2]
+        data = await self._single_flight(key, screen, deadline)
+        if data is None and cached is not None and time.monotonic() - cached[0] < self._max_stale:
+            self.cache_stale_hits += 1
+            return cached[2]
+        return data
 
-    # ---------------------------
-    # NEW: Photo sensor (lux)
-    # ---------------------------
+    async def _fetch_tier(self, screen: str, interval: float, deadline: float | None, fresh: bool) -> dict | None:
+        """Payload of a slower tier: reused for its interval, then fetched again within the poll cycle."""
+        key = (screen, self._entry.data[CONF_TOKEN])
+        cached = self._cache.get(key)
+        if cached is not None and not fresh and time.monotonic() - cached[0] < interval:
+            self.cache_hits += 1
+            return cached[2]
+        data = await self._single_flight(key, screen, deadline)
+        if data is None and cached is not None and time.monotonic() - cached[0] < interval + self._max_stale:
+            # Slow values are old by design; keep them through a failed refresh.
+            return cached[2]
+        return data
 
-    def _find_value_by_id_and_selection(self, obj, target_id: str = "6", target_sel: str = "boiler4"):
-        """Depth-first пошук value у довільній структурі (dict/list) за id і selection."""
-        try:
-            if isinstance(obj, dict):
-                if str(obj.get("id")) == str(target_id) and str(obj.get("selection")) == str(target_sel):
-                    return obj.get("value") or obj.get("val")
-                for v in obj.values():
-                    found = self._find_value_by_id_and_selection(v, target_id, target_sel)
-                    if found is not None:
-                        return found
-                return None
-            if isinstance(obj, list):
-                for item in obj:
-                    found = self._find_value_by_id_and_selection(item, target_id, target_sel)
-                    if found is not None:
-                        return found
-                return None
-            return None
-        except Exception:
+    def _cache_state(self, screen: str | None = None) -> tuple[datetime, bool] | None:
+        """(fetch time, stale) of the cached payload for a screen."""
+        key = (screen or self.screen, self._entry.data[CONF_TOKEN])
+        cached = self._cache.get(key)
+        if cached is None:
             return None
+        return cached[1], key in self._failed
 
-    async def async_get_photo_sensor_lux_from_controller(self) -> float | None:
-        """
-		Illuminance (lux) from controllerdata2.php — we look for an element with id="6" and selection="boiler4".
-		Returns a float or None; does not raise exceptions.
-        """
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
+    async def _single_flight(self, key: tuple[str, str], screen: str, deadline: float | None) -> dict | None:
+        """Concurrent calls for the same screen share one request and the same decoded payload."""
+        task = self._inflight.get(key)
+        # A finished task is only waiting for its done callback to leave _inflight.
+        if task is not None and not task.done():
+            self.requests_coalesced += 1
+        else:
+            task = self._start_request(key, screen, deadline)
+        # Shield: a cancelled caller must not cancel the request the others are waiting on.
         try:
-            raw = self._find_value_by_id_and_selection(data, target_id="6", target_sel="boiler4")
-            if raw in (None, ""):
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # The request itself was cut off at its deadline (cancel_expired_requests), not this caller.
+            if task.cancelled() and not asyncio.current_task().cancelling():
                 return None
-            return float(str(raw).replace(",", "."))
-        except Exception:
-            return None
-    # ---------------------------
-    # NEW: state code (miscdata.state.value)
-    # ---------------------------
-    async def async_get_state_code_from_controller(self) -> str | None:
-        """Return raw state code from miscdata.state.value, e.g., 'state_5'."""
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
-        try:
-            misc = data.get("miscdata") or {}
-            state = misc.get("state") or {}
-            val = state.get("value")
-            if not val:
-                return None
-            return str(val)
-        except Exception:
-            return None
-    async def async_get_pump_state_from_controller(self) -> str | None:
-        """Return 'ON'/'OFF' from leftoutput.output-2.val."""
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
-        try:
-            left = data.get("leftoutput") or {}
-            out2 = left.get("output-2") or {}
-            val = out2.get("val")
-            if val is None:
-                return None
-            # Normalize to uppercase.
-            return str(val).upper()
-        except Exception:
-            return None
-    async def async_get_oxygen_from_controller(self) -> float | None:
-        """
-        Read oxygen level (%) from boilerdata[id=12].value.
-        Returns float in percent.
-        """
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
-        try:
-            boiler = data.get("boilerdata") or []
-            item = next((x for x in boiler if str(x.get("id")) == "12"), None)
-            if not item:
-                return None
-            raw = item.get("value")
-            if raw is None or raw == "":
-                return None
-            return float(raw)
-        except Exception:
-            return None
-            
-    async def async_get_hopper_consumption_24h_kg(self) -> float | None:
-        """
-		From controllerdata2.php: hopperdata[id='3'] or selection='hopper2' → kilograms over the last 24 hours.
-		Returns a float or None.
-        """
-        data = await self._fetch_controller_json()
-        if not data:
-            return None
+            raise
 
-        hopper = (data.get("hopperdata") or [])
-        #1) priority by ID
-        item = next((x for x in hopper if str(x.get("id")) == "3"), None)
-        # 2) fallback option — by selection
-        if not item:
-            item = next((x for x in hopper if str(x.get("selection")) == "hopper2"), None)
-        if not item:
-            return None
+    def _start_request(self, key: tuple[str, str], screen: str, deadline: float | None) -> asyncio.Task:
+        task = asyncio.ensure_future(self._request_controller_json(key, screen, deadline))
+        self._inflight[key] = task
+        if deadline is not None:
+            self._inflight_deadlines[key] = deadline
+        task.add_done_callback(lambda _t: self._cleanup_request(key, task))
+        return task
 
-        raw = item.get("value")
-        if raw in ("", None):
-            return None
+    def _cleanup_request(self, key: tuple[str, str], task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._inflight_deadlines.pop(key, None)
 
+    def cancel_expired_requests(self) -> None:
+        """Cancel reads past their cycle deadline so they cannot overlap the next cycle."""
+        now = asyncio.get_running_loop().time()
+        for key, task in list(self._inflight.items()):
+            if self._inflight_deadlines.get(key, now + 1) <= now:
+                task.cancel()
+
+    async def _request_controller_json(
+        self, key: tuple[str, str], screen: str, deadline: float | None
+    ) -> dict | None:
+        timeout = READ_TIMEOUT
+        if deadline is not None:
+            timeout = min(timeout, deadline - asyncio.get_running_loop().time())
+        if timeout <= 0:
+            # Nothing left of the cycle budget: do not start a request that cannot finish.
+            self.read_stats.record_failure("deadline", 0.0)
+            self._failed.add(key)
+            return None
+        with self.breaker.attempt() as allowed:
+            if not allowed:
+                self.requests_short_circuited += 1
+                self._failed.add(key)
+                return None
+            return await self._send_read(key, screen, deadline, timeout)
+
+    async def _send_read(
+        self, key: tuple[str, str], screen: str, deadline: float | None, timeout: float
+    ) -> dict | None:
+        self.requests_sent += 1
+        started = time.monotonic()
+        data = None
+        body = b""
+        wire_size = None
         try:
-            # For the case of "8,9"
-            return float(str(raw).replace(",", "."))
-        except Exception:
-            return None
-    async def async_get_hopper_content_kg(self) -> float | None:
+            with self.profiler.span("network_io"):
+                async with self._request_slot(), self._session.get(self._read_url(screen), timeout=timeout) as resp:
+                    status = resp.status
+                    if status == 200:
+                        body = await resp.read()
+                        encoding = resp.headers.get(hdrs.CONTENT_ENCODING)
+                        # The shared session decompresses for us; Content-Length is the size sent.
+                        wire_size = len(body) if self._dedicated else (resp.content_length if encoding else len(body))
+            if status != 200:
+                cause = f"http_{status}"
+            else:
+                if self._dedicated and encoding:
+                    with self.profiler.span("decompress"):
+                        # Same cut-off as the decoder: a body that large would hold up the event loop.
+                        if len(body) >= self.decoder.offload_from:
+                            body = await self._hass.async_add_executor_job(decompress, body, encoding)
+                        else:
+                            body = decompress(body, encoding)
+                with self.profiler.span("json_decode"):
+                    data = await self.decoder.async_decode(body)
+                cause = None if data else "empty"
+        except asyncio.CancelledError:
+            self._failed.add(key)
+            if deadline is not None and asyncio.get_running_loop().time() >= deadline:
+                # Cut off by cancel_expired_requests: the cloud did not answer within the cycle.
+                self.read_stats.record_failure("deadline", time.monotonic() - started)
+                self.breaker.record_failure()
+            raise
+        except asyncio.TimeoutError as err:
+            cause, error = "timeout", repr(err)
+        except ClientError as err:
+            cause, error = "connection", repr(err)
+        except ValueError as err:
+            cause, error, data = "json", repr(err), None
+        except zlib.error as err:
+            cause, error = "encoding", repr(err)
+        else:
+            error = None
+        if cause is None and not isinstance(data, dict):
+            cause, data = "json", None
+        latency = time.monotonic() - started
+        if cause is None:
+            self.read_stats.record_success(latency, len(body), wire_size)
+            self.breaker.record_success()
+            self._cache[key] = (time.monotonic(), datetime.now(timezone.utc), data)
+            self._failed.discard(key)
+            return data
+        self.read_stats.record_failure(cause, latency, error)
+        if is_outage(cause):
+            self.breaker.record_failure()
+        else:
+            # The service answered; the problem is the request or the controller, not the cloud.
+            self.breaker.record_success()
+        # Warn once per outage; the rest is counted in the diagnostics.
+        log = _LOGGER.debug if key in self._failed else _LOGGER.warning
+        log("%s: controllerdata2.php request failed (%s)%s", self._entry.title, cause, f": {error}" if error else "")
+        self._failed.add(key)
+        return None
+
+    async def async_fetch_controller_data(
+        self, fresh: bool = False, deadline: float | None = None
+    ) -> ControllerSnapshot | None:
         """
-        Reads frontdata → id='hoppercontent' → value (kg) from controllerdata2.php.
+        Fetch the controller screen once, plus any slower tier that is due, and build the
+        indexed snapshot the platforms read. Returns None when the main request fails.
+        fresh=True always asks the controller; deadline (loop time) is the end of the poll cycle's budget.
         """
-        try:
-            from yarl import URL
-            params = {"screen": DEFAULT_SCREEN_QUERY, "token": self._entry.data[CONF_TOKEN]}
-            async with self._session.get(str(URL(CONTROLLERDATA_URL).with_query(params)), timeout=15) as resp:
-                if resp.status != 200:
-                    return None
-                data = await resp.json(content_type=None)
-        except Exception:
+        if not self.tier_screens:
+            tiers = ()
+            data = await self._fetch_controller_json(deadline=deadline, fresh=fresh)
+        else:
+            data, *tiers = await asyncio.gather(
+                self._fetch_controller_json(deadline=deadline, fresh=fresh),
+                *(self._fetch_tier(screen, interval, deadline, fresh) for _t, screen, interval in self.tier_screens),
+            )
+        if not data:
             return None
+        with self.profiler.span("index"):
+            snap = ControllerSnapshot(data)
+            # The main screen is indexed first, so its copy of shared sections wins.
+            for tier_data in tiers:
+                if tier_data:
+                    snap.merge(tier_data)
+        if (cache_state := self._cache_state()) is not None:
+            snap.fetched_at, snap.stale = cache_state
+        with self.profiler.span("extraction"):
+            return build_snapshot(snap, self._selections)
 
-        front = (data or {}).get("frontdata") or []
-        item = next((x for x in front if str(x.get("id")) == "hoppercontent"), None)
-        if not item:
-            return None
+    async def async_set_dhw_diff_under_temp(self, value_c: float) -> bool:
+        """dhwdata[id=='3'] → °C."""
 
-        raw = item.get("value")
-        if raw in ("", None):
-            return None
+        token = self._entry.data.get(CONF_TOKEN)
+        if not token:
+            return False
 
-        try:
-            return float(str(raw).replace(",", "."))
-        except Exception:
-            return None
+        payload = {
+            "menu": "hot_water.diff_under",
+            "name": "hot_water.diff_under",
+            "token": token,
+            "value": f"{float(value_c):.1f}",
+        }
+        return await self._post(UPDATE_URL, payload)
 
-    async def async_set_hopper_content_kg(self, value_kg: float) -> None:
+    async def async_set_hopper_content_kg(self, value_kg: float) -> bool:
         """
 		Updates hopper.content via POST form-data to updatevalue.php.
-		Optimistic model: we do not parse the response and do not check the status.
+		Optimistic model: we do not parse the response body, only the status.
         """
         token = self._entry.data.get(CONF_TOKEN)
         if not token:
-            return
+            return False
 
         payload = {
             "menu": "hopper.content",
@@ -408,8 +433,4 @@ class StokerCloudWriteApi:
             "token": token,
             "value": f"{float(value_kg):.1f}",
         }
-        try:
-            async with self._session.post(UPDATE_URL, data=payload, timeout=10):
-                pass
-        except Exception:
-            return
+        return await self._post(UPDATE_URL, payload)
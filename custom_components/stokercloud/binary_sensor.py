@@ -1,61 +1,37 @@
 from __future__ import annotations
 import logging
-from datetime import timedelta
 
 from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorDeviceClass
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, CoordinatorEntity
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, ATTR_MANUFACTURER, CONF_SERIAL, CONF_NAME, BOILER_SCAN_INTERVAL
-from .api import StokerCloudWriteApi
+from .const import DOMAIN
+from .coordinator import StokerCloudCoordinator
+from .entity import StokerCloudEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
-    api: StokerCloudWriteApi = hass.data[DOMAIN][entry.entry_id]
+    coordinator: StokerCloudCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async def _upd_running():
-        return await api.async_get_boiler_running_from_controller()
+    async_add_entities([BoilerRunningBinarySensor(entry, coordinator)])
 
-    coordinator = DataUpdateCoordinator[bool | None](
-        hass,
-        _LOGGER,
-        name=f"{DOMAIN}_boiler_running",
-        update_method=_upd_running,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
 
-    await coordinator.async_config_entry_first_refresh()
-
-    async_add_entities([BoilerRunningBinarySensor(entry, coordinator)], True)
-
-
-class BoilerRunningBinarySensor(CoordinatorEntity[DataUpdateCoordinator[bool | None]], BinarySensorEntity):
-    _attr_has_entity_name = True
+class BoilerRunningBinarySensor(StokerCloudEntity, BinarySensorEntity):
     _attr_name = "Boiler running"
     _attr_device_class = BinarySensorDeviceClass.POWER  # or remove device_class if you prefer
     _attr_icon = "mdi:power"
+    _value_key = "boiler_running"
 
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[bool | None]):
-        super().__init__(coordinator)
-        serial = entry.data.get(CONF_SERIAL, "unknown")
-        dev_name = entry.data.get(CONF_NAME) or f"NBE {serial}"
-        self._attr_unique_id = f"{serial}_boiler_running"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, serial)},
-            manufacturer=ATTR_MANUFACTURER,
-            name=dev_name,
-            model="StokerCloud",
-        )
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "boiler_running")
 
     @property
     def available(self) -> bool:
-        return self.coordinator.data is not None
+        return super().available and self.value is not None
 
     @property
     def is_on(self) -> bool | None:
-        return self.coordinator.data
+        return self.value
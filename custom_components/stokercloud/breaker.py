@@ -0,0 +1,95 @@
+from __future__ import annotations
+import random
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from .const import BREAKER_FAILURE_THRESHOLD, BREAKER_BASE_BACKOFF, BREAKER_MAX_BACKOFF
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+BREAKER_STATES = [CLOSED, OPEN, HALF_OPEN]
+
+
+def is_outage(cause: str) -> bool:
+    """Failures that say the service is down or struggling (not e.g. a rejected token)."""
+    return cause in ("timeout", "connection", "json") or cause.startswith("http_5")
+
+
+class CircuitBreaker:
+    """
+    Per-entry breaker for requests to stokercloud.dk.
+    After BREAKER_FAILURE_THRESHOLD outage failures in a row it opens: requests fail fast for a
+    jittered, exponentially growing backoff. Then one probe is let through (half-open); its
+    result closes the breaker again or reopens it with a longer backoff.
+    """
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_FAILURE_THRESHOLD,
+        base_backoff: float = BREAKER_BASE_BACKOFF,
+        max_backoff: float = BREAKER_MAX_BACKOFF,
+    ):
+        self._threshold = threshold
+        self._base = base_backoff
+        self._max = max_backoff
+        self.state = CLOSED
+        self.failures = 0
+        # Times opened since the last success: the exponent of the next backoff.
+        self._opens = 0
+        self.trips = 0
+        self._open_until = 0.0
+        self.open_until: datetime | None = None
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Whether a request may go out now; in half-open state only one probe at a time."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() < self._open_until:
+                return False
+            self.state = HALF_OPEN
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    @contextmanager
+    def attempt(self) -> Iterator[bool]:
+        """
+        One request: yields whether it may go out (see allow). A half-open probe that ends without
+        record_success / record_failure (cancelled, unexpected error) is released for the next one.
+        """
+        allowed = self.allow()
+        probe = allowed and self.state == HALF_OPEN
+        try:
+            yield allowed
+        finally:
+            if probe and self.state == HALF_OPEN:
+                self._probing = False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._opens = 0
+        self._probing = False
+        self.open_until = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or self.failures >= self._threshold:
+            self._open()
+
+    def _open(self) -> None:
+        backoff = min(self._max, self._base * 2 ** self._opens)
+        # Equal jitter: entries that failed together do not all retry together.
+        backoff = backoff / 2 + random.uniform(0, backoff / 2)
+        self._opens += 1
+        self.trips += 1
+        self.state = OPEN
+        self._open_until = time.monotonic() + backoff
+        self.open_until = datetime.now(timezone.utc) + timedelta(seconds=backoff)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+import zlib
+
+import aiohttp
+from aiohttp import hdrs
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE, async_get_clientsession
+from homeassistant.util import ssl as ssl_util
+
+from .const import DOMAIN, DATA_SESSION, DATA_SESSION_CLOSE, CLIENT_POOL_SIZE, CLIENT_KEEPALIVE, CLIENT_DNS_TTL
+
+
+def get_session(hass: HomeAssistant, dedicated: bool) -> aiohttp.ClientSession:
+    """Home Assistant's shared session, or the dedicated stokercloud.dk one (created on first use)."""
+    if not dedicated:
+        return async_get_clientsession(hass)
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (session := domain_data.get(DATA_SESSION)) is None or session.closed:
+        _remove_close_listener(domain_data)
+        session = domain_data[DATA_SESSION] = _create_session(hass)
+    return session
+
+
+def _create_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=CLIENT_POOL_SIZE,
+        limit_per_host=CLIENT_POOL_SIZE,
+        keepalive_timeout=CLIENT_KEEPALIVE,
+        use_dns_cache=True,
+        ttl_dns_cache=CLIENT_DNS_TTL,
+        ssl=ssl_util.get_default_context(),
+    )
+    # auto_decompress=False: the body is read as sent, so its size on the wire can be reported.
+    session = aiohttp.ClientSession(
+        connector=connector,
+        auto_decompress=False,
+        headers={hdrs.USER_AGENT: SERVER_SOFTWARE, hdrs.ACCEPT_ENCODING: "gzip, deflate"},
+    )
+
+    async def _close(_event: Event) -> None:
+        # A fired listen_once listener is already gone.
+        hass.data[DOMAIN].pop(DATA_SESSION_CLOSE, None)
+        await session.close()
+
+    hass.data[DOMAIN][DATA_SESSION_CLOSE] = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _close)
+    return session
+
+
+def _remove_close_listener(domain_data: dict) -> None:
+    if (unsub := domain_data.pop(DATA_SESSION_CLOSE, None)) is not None:
+        unsub()
+
+
+async def async_close_session(hass: HomeAssistant) -> None:
+    """Close the dedicated session once no entry uses it."""
+    domain_data = hass.data.get(DOMAIN, {})
+    _remove_close_listener(domain_data)
+    if (session := domain_data.pop(DATA_SESSION, None)) is not None:
+        await session.close()
+
+
+def decompress(body: bytes, encoding: str | None) -> bytes:
+    """Decode a body read with auto_decompress=False; raises zlib.error if it is corrupt."""
+    if encoding == "gzip":
+        return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            # Some servers send raw deflate without the zlib header.
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
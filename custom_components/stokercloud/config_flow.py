@@ -2,9 +2,16 @@ from __future__ import annotations
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN, CONF_SERIAL, CONF_TOKEN, CONF_NAME
+from .const import (
+    DOMAIN, CONF_SERIAL, CONF_TOKEN, CONF_NAME,
+    CONF_CACHE_TTL, CONF_MAX_STALE, DEFAULT_CACHE_TTL, DEFAULT_MAX_STALE,
+    CONF_MIN_SCAN_INTERVAL, CONF_MAX_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL,
+    CONF_WRITE_DEBOUNCE, DEFAULT_WRITE_DEBOUNCE, CONF_CYCLE_BUDGET, DEFAULT_CYCLE_BUDGET,
+    CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE, DEADBAND_OPTIONS, CONF_DEDICATED_SESSION,
+)
 
 
 class StokerCloudWriteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -12,6 +19,11 @@ class StokerCloudWriteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
+        return StokerCloudOptionsFlow()
+
     async def async_step_user(self, user_input=None) -> FlowResult:
         if user_input is not None:
             serial = user_input[CONF_SERIAL]
@@ -31,3 +43,42 @@ class StokerCloudWriteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }
         )
         return self.async_show_form(step_id="user", data_schema=schema)
+
+
+class StokerCloudOptionsFlow(config_entries.OptionsFlow):
+    """Polling, cache, write and deadband tuning; saving reloads the entry."""
+
+    if not hasattr(config_entries.OptionsFlow, "config_entry"):
+        # Home Assistant provides config_entry from 2024.11; older cores only set the handler (entry id).
+        @property
+        def config_entry(self) -> config_entries.ConfigEntry:
+            return self.hass.config_entries.async_get_entry(self.handler)
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        errors = {}
+        if user_input is not None:
+            if user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_MAX_SCAN_INTERVAL]:
+                errors[CONF_MIN_SCAN_INTERVAL] = "min_above_max"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+
+        def _field(key: str, default, minimum: float, maximum: float, kind=vol.Coerce(float)):
+            return vol.Optional(key, default=options.get(key, default)), vol.All(kind, vol.Range(min=minimum, max=maximum))
+
+        fields = [
+            _field(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL, 5, 3600, vol.Coerce(int)),
+            _field(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL, 5, 3600, vol.Coerce(int)),
+            _field(CONF_CYCLE_BUDGET, DEFAULT_CYCLE_BUDGET, 1, 120),
+            _field(CONF_CACHE_TTL, DEFAULT_CACHE_TTL, 0, 300),
+            _field(CONF_MAX_STALE, DEFAULT_MAX_STALE, 0, 86400),
+            _field(CONF_WRITE_DEBOUNCE, DEFAULT_WRITE_DEBOUNCE, 0, 30),
+        ]
+        for abs_key, rel_key in DEADBAND_OPTIONS.values():
+            fields.append(_field(abs_key, 0, 0, 1000))
+            fields.append(_field(rel_key, 0, 0, 100))
+        fields.append(_field(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE, 30, 86400, vol.Coerce(int)))
+        fields.append((vol.Optional(CONF_DEDICATED_SESSION, default=options.get(CONF_DEDICATED_SESSION, False)), bool))
+
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(dict(fields)), errors=errors)
@@ -18,15 +18,128 @@ DEFAULT_STEP = 1.0
 # Polling
 BOILER_SCAN_INTERVAL = 20  # seconds
 
+# Adaptive polling (entry options): fast during ignition, power changes and after writes,
+# slow when the boiler is off or idle; BOILER_SCAN_INTERVAL otherwise.
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+DEFAULT_MIN_SCAN_INTERVAL = 10  # seconds
+DEFAULT_MAX_SCAN_INTERVAL = 300  # seconds
+FAST_POLL_STATES = ("state_2",)  # Ignition
+IDLE_POLL_STATES = ("state_14",)  # OFF
+FAST_POLL_AFTER_WRITE = 120  # seconds of fast polling after a write
+POWER_CHANGE_THRESHOLD = 5.0  # output % change between polls that counts as a transition
+
+# Cadence tiers for screen slots (fields.Field.tier). Fast slots ride on every poll; normal and
+# slow slots are fetched as their own screen at most once per interval and merged into the snapshot.
+# frontdata, miscdata, leftoutput and weathercomp come with every screen, so they are always fast.
+TIER_FAST = "fast"
+TIER_NORMAL = "normal"
+TIER_SLOW = "slow"
+TIER_INTERVALS = {TIER_NORMAL: 60, TIER_SLOW: 600}  # seconds
+
+# Fleet mode: domain-wide scheduler in hass.data[DOMAIN][DATA_FLEET]
+DATA_FLEET = "fleet"
+FLEET_MAX_CONCURRENT_REQUESTS = 4
+
+# Dedicated HTTP client (entry option): one keep-alive pool for stokercloud.dk shared by the entries
+# that enable it, in hass.data[DOMAIN][DATA_SESSION]. Keep-alive outlasts the default poll interval
+# so polls reuse the connection; responses are requested compressed and decoded by the integration.
+CONF_DEDICATED_SESSION = "dedicated_session"
+DATA_SESSION = "session"
+DATA_SESSION_CLOSE = "session_close"  # unsubscribe of its EVENT_HOMEASSISTANT_CLOSE listener
+CLIENT_POOL_SIZE = FLEET_MAX_CONCURRENT_REQUESTS
+CLIENT_KEEPALIVE = 75  # seconds
+CLIENT_DNS_TTL = 300  # seconds
+
+# Deadline for the first fetch after setup (it runs in the background)
+STARTUP_REFRESH_TIMEOUT = 30  # seconds
+
+# Last good snapshot per entry, kept in .storage so entities have values right after a restart.
+# It is shown as stale until the first fetch lands, and ignored once older than SNAPSHOT_MAX_AGE.
+SNAPSHOT_STORAGE_KEY = "stokercloud.{}_snapshot"  # formatted with the entry id
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60  # seconds; at most one write to disk per minute
+SNAPSHOT_MAX_AGE = 86400  # seconds
+
+# Poll cycle budget (entry option): every request of one cycle shares this deadline, capped at
+# the current poll interval so a slow cycle never runs into the next one.
+CONF_CYCLE_BUDGET = "cycle_budget"
+DEFAULT_CYCLE_BUDGET = 15  # seconds
+READ_TIMEOUT = 15  # seconds, upper bound for a single controllerdata2.php request
+WRITE_TIMEOUT = 10  # seconds, per updatevalue.php request
+
+# Response cache (entry options): reads younger than the TTL are served from memory;
+# older payloads are fetched again, and served (marked stale) only while that fails.
+CONF_CACHE_TTL = "cache_ttl"
+CONF_MAX_STALE = "max_stale"
+DEFAULT_CACHE_TTL = 10  # seconds
+DEFAULT_MAX_STALE = 600  # seconds
+
+# Writes (entry option): submissions per parameter inside this window collapse to the latest value
+CONF_WRITE_DEBOUNCE = "write_debounce"
+DEFAULT_WRITE_DEBOUNCE = 1.0  # seconds
+
+# Writes to one boiler in flight at once (different parameters; one parameter is always serialized)
+WRITE_MAX_CONCURRENT = 2
+# updatevalue.php name → snapshot value it sets, for read-after-write confirmation
+WRITE_VALUE_KEYS = {
+    "boiler.temp": "wanted_boiler_temperature",
+    "hopper.content": "hopper_content",
+    "hot_water.diff_under": "dhw_difference_under",
+}
+# How far the reported value may be from the written one and still confirm it (default 0.5).
+WRITE_CONFIRM_TOLERANCE = {"hopper.content": 1.0}
+
+# Durable command queue: writes that failed because stokercloud.dk was unreachable are kept per
+# parameter in .storage and retried with exponential backoff until delivered or expired.
+COMMAND_STORAGE_KEY = "stokercloud.{}_commands"  # formatted with the entry id
+COMMAND_STORAGE_VERSION = 1
+COMMAND_RETRY_BASE = 30  # seconds
+COMMAND_RETRY_MAX = 900  # seconds
+COMMAND_EXPIRY = 3600  # seconds after the first failed attempt
+# Commands that must not run long after they were given: a boiler start/stop is dropped soon.
+COMMAND_EXPIRY_SHORT = {"misc.power": 120}  # seconds
+
+# Read-after-write confirmation: poll until the controller reports the written value
+CONFIRM_POLL_INTERVAL = 3  # seconds
+CONFIRM_MAX_POLLS = 10
+CONFIRM_TIMEOUT = 45  # seconds
+WRITE_PENDING = "pending"
+WRITE_CONFIRMED = "confirmed"
+WRITE_FAILED = "failed"
+
+# Deadband filtering (entry options), per sensor class: a value is published only when it moves
+# more than the absolute band (sensor unit) or the relative band (% of the published value)
+# away from the last published one, or after max_silence seconds as a heartbeat. 0 disables a band.
+# Sensor class → (absolute band option, relative band option)
+DEADBAND_OPTIONS = {
+    "temperature": ("deadband_temperature_abs", "deadband_temperature_rel"),
+    "oxygen": ("deadband_oxygen_abs", "deadband_oxygen_rel"),
+    "power": ("deadband_power_abs", "deadband_power_rel"),
+    "illuminance": ("deadband_illuminance_abs", "deadband_illuminance_rel"),
+}
+CONF_MAX_SILENCE = "max_silence"
+DEFAULT_MAX_SILENCE = 900  # seconds
+
+# Circuit breaker for cloud outages: open after this many failures in a row, then back off
+# exponentially (with jitter) between single probe requests.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BASE_BACKOFF = 30  # seconds
+BREAKER_MAX_BACKOFF = 900  # seconds
+
+# Fetch telemetry (diagnostics): latency and size are kept for this many recent requests
+TELEMETRY_WINDOW = 100
+
+# JSON decoding of controllerdata2.php bodies: bodies this large are decoded in the executor, and so
+# are bodies as large as one whose decode blocked the event loop for longer than DECODE_LOOP_BUDGET.
+DECODE_EXECUTOR_BYTES = 256 * 1024
+DECODE_LOOP_BUDGET = 0.005  # seconds
+
+# Profiling (stokercloud.start_profiling / stop_profiling), shared by all entries
+DATA_PROFILER = "profiler"
+PROFILE_FILE = "stokercloud_profile_{}.json"  # in the config directory, formatted with a timestamp
+
 # Power control
 MISC_START_NAME = "misc.start"
 MISC_STOP_NAME  = "misc.stop"
 MISC_CMD_VALUE  = "1"
-
-# Screen as in your DevTools (you can change it to another if needed)
-DEFAULT_SCREEN_QUERY = (
-    "b1,3,b2,5,b3,4,b4,6,b5,12,b6,14,b7,15,b8,16,b9,9,b10,0,"
-    "d1,3,d2,4,d3,0,d4,0,d5,0,d6,0,d7,0,d8,0,d9,0,d10,0,"
-    "h1,2,h2,3,h3,4,h4,7,h5,8,h6,0,h7,0,h8,0,h9,0,h10,0,"
-    "w1,2,w2,3,w3,9,w4,7,w5,4"
-)
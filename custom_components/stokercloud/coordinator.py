@@ -0,0 +1,290 @@
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    DOMAIN, CONF_SERIAL, BOILER_SCAN_INTERVAL, STARTUP_REFRESH_TIMEOUT,
+    CONF_CYCLE_BUDGET, DEFAULT_CYCLE_BUDGET,
+    CONF_MIN_SCAN_INTERVAL, CONF_MAX_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL,
+    FAST_POLL_STATES, IDLE_POLL_STATES, FAST_POLL_AFTER_WRITE, POWER_CHANGE_THRESHOLD,
+    CONFIRM_POLL_INTERVAL, CONFIRM_MAX_POLLS, CONFIRM_TIMEOUT,
+    WRITE_PENDING, WRITE_CONFIRMED, WRITE_FAILED, WRITE_VALUE_KEYS, WRITE_CONFIRM_TOLERANCE,
+)
+from .api import StokerCloudWriteApi
+from .fleet import StokerCloudFleet
+from .snapshot import ControllerSnapshot
+from .snapshot_store import SnapshotStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StokerCloudCoordinator(DataUpdateCoordinator[ControllerSnapshot]):
+    """
+    One coordinator per config entry: fetches controllerdata2.php once per cycle
+    and publishes the indexed snapshot that every platform reads from.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, api: StokerCloudWriteApi, fleet: StokerCloudFleet | None = None
+    ):
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{entry.data.get(CONF_SERIAL, entry.entry_id)}",
+            update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
+        )
+        self.entry = entry
+        self.api = api
+        self.fleet = fleet
+        self._next_poll: float | None = None
+        if fleet is not None:
+            entry.async_on_unload(fleet.async_register(entry.entry_id))
+        # Measured startup cost: async_setup_entry wall time and time until the first payload.
+        self.setup_seconds: float | None = None
+        self.first_data_seconds: float | None = None
+        # Last good snapshot kept across restarts; restored_from is its fetch time while shown.
+        self.store = SnapshotStore(hass, entry.entry_id)
+        self.restored_from: datetime | None = None
+        # Adaptive polling bounds; poll_mode tells why the current interval was chosen.
+        self._min_interval = float(entry.options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL))
+        self._max_interval = float(entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL))
+        self._fast_until = 0.0
+        self.poll_mode = "normal"
+        # Interval the boiler state asks for; update_interval is it moved onto the fleet phase.
+        self.poll_interval = float(BOILER_SCAN_INTERVAL)
+        # Total time one poll cycle may take; cycles cut off at the deadline are counted.
+        self._cycle_budget = float(entry.options.get(CONF_CYCLE_BUDGET, DEFAULT_CYCLE_BUDGET))
+        self.cycle_overruns = 0
+        self._startup_refresh = False
+        self._cycle_started: float | None = None
+        self.last_cycle_seconds: float | None = None
+        # Read-after-write confirmation per snapshot value: pending / confirmed / failed.
+        self.write_status: dict[str, str] = {}
+        # Snapshot values changed since listeners were last notified; None means "everything"
+        # (first data, availability or staleness changed). Entities skip their state write otherwise.
+        self.changed_keys: set[str] | None = None
+        self._published: ControllerSnapshot | None = None
+        self._published_success: bool | None = None
+        self._dirty_keys: set[str] = set()
+        self._confirm_tasks: dict[str, asyncio.Task] = {}
+        self._unconfirmed: dict[str, float] = {}
+        # Queued writes: their diagnostic entities follow the queue, delivered ones are confirmed.
+        entry.async_on_unload(api.outbox.async_add_listener(self.async_update_listeners))
+        entry.async_on_unload(api.outbox.async_add_delivery_listener(self.async_handle_write))
+
+    @callback
+    def async_update_listeners(self) -> None:
+        prev, self._published = self._published, self.data
+        prev_success, self._published_success = self._published_success, self.last_update_success
+        if (
+            prev is None
+            or self.data is None
+            or prev_success != self.last_update_success
+            or prev.stale != self.data.stale
+        ):
+            self.changed_keys = None
+        else:
+            self.changed_keys = self.data.changed_keys(prev) | self._dirty_keys
+        self._dirty_keys.clear()
+        super().async_update_listeners()
+        # Set by the poll that just finished; other updates (optimistic values, the queue) are not cycles.
+        if (started := self._cycle_started) is not None:
+            self._cycle_started = None
+            self._record_cycle(started)
+
+    def _set_write_status(self, key: str, status: str) -> None:
+        self.write_status[key] = status
+        # Shown as an entity attribute, so the entity must write even if its value did not change.
+        self._dirty_keys.add(key)
+
+    async def async_restore_snapshot(self) -> None:
+        """Show the values stored before the restart (marked stale) until the first fetch lands."""
+        if self.data is not None or (snap := await self.store.async_load()) is None:
+            return
+        # Set directly: listeners are not attached yet and read it when they are added.
+        self.data = snap
+        self.restored_from = snap.fetched_at
+        _LOGGER.debug("%s: restored snapshot fetched at %s", self.name, snap.fetched_at)
+
+    async def async_initial_refresh(self, started: float) -> None:
+        """First fetch, run in the background; entities are already registered and fill in when it lands."""
+        # Bound it on its own budget so a slow cloud cannot keep entities unknown for minutes.
+        self._startup_refresh = True
+        try:
+            await self.async_refresh()
+        finally:
+            self._startup_refresh = False
+        self.first_data_seconds = time.monotonic() - started
+        _LOGGER.debug(
+            "%s: first data after %.3f s (success: %s)",
+            self.name, self.first_data_seconds, self.last_update_success,
+        )
+
+    async def _async_update_data(self) -> ControllerSnapshot:
+        if self.fleet is not None and self._next_poll is not None:
+            self.fleet.schedule_lag[self.entry.entry_id] = max(0.0, self.hass.loop.time() - self._next_poll)
+            self._next_poll = None
+        started = time.perf_counter()
+        try:
+            data = await self._async_poll()
+        except Exception:
+            # A failure after a failure notifies no listeners: the cycle ends here.
+            if not self.last_update_success:
+                self._record_cycle(started)
+            else:
+                self._cycle_started = started
+            raise
+        else:
+            self._cycle_started = started
+            return data
+        finally:
+            # DataUpdateCoordinator schedules the next poll update_interval from now, right after this.
+            self._phase_next_poll()
+
+    def _record_cycle(self, started: float) -> None:
+        # Whole cycle: fetch, decode, extraction and the entity state writes (profiling only).
+        if self.api.profiler.enabled:
+            self.api.profiler.record("update_cycle", time.perf_counter() - started)
+
+    def _phase_next_poll(self) -> None:
+        """Stretch or shorten the next interval so this entry's poll lands on its phase in the fleet."""
+        if self.fleet is None:
+            self.update_interval = timedelta(seconds=self.poll_interval)
+            return
+        now = self.hass.loop.time()
+        self._next_poll = self.fleet.next_poll(self.entry.entry_id, now, self.poll_interval)
+        self.update_interval = timedelta(seconds=self._next_poll - now)
+
+    async def _async_poll(self) -> ControllerSnapshot:
+        budget = self._budget()
+        started = self.hass.loop.time()
+        deadline = started + budget
+        try:
+            async with asyncio.timeout_at(deadline):
+                data = await self.api.async_fetch_controller_data(deadline=deadline)
+        except TimeoutError:
+            self.api.cancel_expired_requests()
+            self.cycle_overruns += 1
+            raise UpdateFailed(f"Poll cycle cut off after its {budget:.0f} s budget") from None
+        finally:
+            self.last_cycle_seconds = self.hass.loop.time() - started
+        if data is None:
+            raise UpdateFailed("No data from controllerdata2.php")
+        self._adapt_interval(data)
+        self.store.async_save(data)
+        if not data.stale:
+            self.restored_from = None
+        return self._with_unconfirmed(data)
+
+    def _budget(self) -> float:
+        """Seconds the current cycle may take: never past the next scheduled poll (except the first fetch)."""
+        if self._startup_refresh:
+            return STARTUP_REFRESH_TIMEOUT
+        if self.update_interval is None:
+            return self._cycle_budget
+        return min(self._cycle_budget, self.update_interval.total_seconds())
+
+    def _with_unconfirmed(self, snap: ControllerSnapshot) -> ControllerSnapshot:
+        # Polls must not flip a written value back while its confirmation is pending.
+        for key, expected in self._unconfirmed.items():
+            snap = snap.with_value(key, expected)
+        return snap
+
+    def _adapt_interval(self, snap: ControllerSnapshot) -> None:
+        """Pick the next poll interval from the boiler state (miscdata.state / miscdata.running)."""
+        state = snap.get("state")
+        pct = snap.get("power_percent")
+        prev_pct = self.data.get("power_percent") if self.data else None
+        if time.monotonic() < self._fast_until:
+            mode, seconds = "write", self._min_interval
+        elif state in FAST_POLL_STATES:
+            mode, seconds = "ignition", self._min_interval
+        elif pct is not None and prev_pct is not None and abs(pct - prev_pct) >= POWER_CHANGE_THRESHOLD:
+            mode, seconds = "power_change", self._min_interval
+        elif state in IDLE_POLL_STATES or snap.get("boiler_running") is False:
+            mode, seconds = "idle", self._max_interval
+        else:
+            mode, seconds = "normal", min(max(BOILER_SCAN_INTERVAL, self._min_interval), self._max_interval)
+        self.poll_mode = mode
+        self.poll_interval = seconds
+
+    @callback
+    def async_boost_polling(self) -> None:
+        """Poll at the minimum interval for a while, e.g. right after a write."""
+        self._fast_until = time.monotonic() + FAST_POLL_AFTER_WRITE
+        self.poll_mode = "write"
+        self.poll_interval = self._min_interval
+        self.update_interval = timedelta(seconds=self._min_interval)
+        # The refresh reschedules polling at the new interval (bursts are debounced).
+        self.entry.async_create_background_task(
+            self.hass, self.async_request_refresh(), f"{self.name}_boost_polling"
+        )
+
+    @callback
+    def async_handle_write(self, name: str, value: Any) -> None:
+        """Follow up a write the controller accepted: confirm the value it sets and poll closely."""
+        if (key := WRITE_VALUE_KEYS.get(name)) is not None:
+            self.async_confirm_write(
+                key,
+                float(int(round(value))) if name == "boiler.temp" else float(value),
+                WRITE_CONFIRM_TOLERANCE.get(name, 0.5),
+            )
+        self.async_boost_polling()
+
+    @callback
+    def async_set_optimistic_value(self, key: str, value: Any) -> None:
+        """Publish a just-written value to every listener without waiting for the next poll."""
+        if self.data is None:
+            return
+        self.async_set_updated_data(self.data.with_value(key, value))
+
+    @callback
+    def async_confirm_write(self, key: str, expected: float, tolerance: float = 0.5) -> None:
+        """Poll at a short interval until the controller reports the written value, or give up."""
+        if (task := self._confirm_tasks.pop(key, None)) is not None:
+            task.cancel()
+        self._set_write_status(key, WRITE_PENDING)
+        self._unconfirmed[key] = expected
+        self.async_set_optimistic_value(key, expected)
+        self._confirm_tasks[key] = self.entry.async_create_background_task(
+            self.hass, self._async_confirm(key, expected, tolerance), f"{self.name}_confirm_{key}"
+        )
+
+    async def _async_confirm(self, key: str, expected: float, tolerance: float) -> None:
+        deadline = time.monotonic() + CONFIRM_TIMEOUT
+        status, snap = WRITE_FAILED, None
+        try:
+            for _ in range(CONFIRM_MAX_POLLS):
+                if time.monotonic() + CONFIRM_POLL_INTERVAL > deadline:
+                    break
+                await asyncio.sleep(CONFIRM_POLL_INTERVAL)
+                budget = min(self._budget(), deadline - time.monotonic())
+                snap = await self.api.async_fetch_controller_data(
+                    fresh=True, deadline=self.hass.loop.time() + budget
+                ) or snap
+                value = snap.get(key) if snap else None
+                if value is not None and abs(value - expected) <= tolerance:
+                    status = WRITE_CONFIRMED
+                    break
+                if snap is not None:
+                    # Keep showing the written value while the controller catches up.
+                    self.async_set_updated_data(self._with_unconfirmed(snap))
+        finally:
+            if self._confirm_tasks.get(key) is asyncio.current_task():
+                del self._confirm_tasks[key]
+                self._unconfirmed.pop(key, None)
+        self._set_write_status(key, status)
+        if status == WRITE_FAILED:
+            _LOGGER.warning("%s: controller did not confirm %s=%s", self.name, key, expected)
+        # Publish what the controller actually reports; the regular cadence resumes from here.
+        if snap is not None:
+            self.async_set_updated_data(self._with_unconfirmed(snap))
+        else:
+            self.async_update_listeners()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+from collections.abc import Mapping
+from typing import Any
+
+from .const import DEADBAND_OPTIONS, CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE
+
+
+class Deadband:
+    """
+    Publish filter for one sensor: a new value is shown only when it leaves the band
+    around the last published value, or max_silence seconds have passed since then.
+    The band is centred on the published value, so noise around one value never flaps.
+    """
+
+    __slots__ = ("absolute", "relative", "max_silence", "value", "at")
+
+    def __init__(self, absolute: float, relative: float, max_silence: float):
+        self.absolute = absolute
+        # Fraction of the published value, e.g. 0.05 for 5 %.
+        self.relative = relative
+        self.max_silence = max_silence
+        self.value: float | None = None
+        self.at = 0.0
+
+    def accept(self, value: Any, now: float, force: bool = False) -> bool:
+        """Whether to publish value; remembers it as the published value if so."""
+        if (
+            force
+            or value is None
+            or self.value is None
+            or now - self.at >= self.max_silence
+            or self._outside(value)
+        ):
+            self.value = value
+            self.at = now
+            return True
+        return False
+
+    def _outside(self, value: float) -> bool:
+        delta = abs(value - self.value)
+        if self.absolute and delta > self.absolute:
+            return True
+        return bool(self.relative) and delta > self.relative * abs(self.value)
+
+
+def deadband_for(options: Mapping[str, Any], sensor_class: str | None) -> Deadband | None:
+    """Filter configured in the entry options for a sensor class; None when it has no band."""
+    if sensor_class not in DEADBAND_OPTIONS:
+        return None
+    abs_key, rel_key = DEADBAND_OPTIONS[sensor_class]
+    absolute = float(options.get(abs_key, 0) or 0)
+    relative = float(options.get(rel_key, 0) or 0) / 100
+    if not absolute and not relative:
+        return None
+    return Deadband(absolute, relative, float(options.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE)))
@@ -0,0 +1,66 @@
+from __future__ import annotations
+import json
+import time
+from collections import deque
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DECODE_EXECUTOR_BYTES, DECODE_LOOP_BUDGET, TELEMETRY_WINDOW
+
+try:
+    import orjson
+except ImportError:  # Home Assistant ships orjson; the standard library is the fallback.
+    orjson = None
+
+# Name → loads(bytes), fastest first.
+DECODERS: dict[str, Any] = {"json": json.loads}
+if orjson is not None:
+    DECODERS = {"orjson": orjson.loads, **DECODERS}
+
+
+class JsonDecoder:
+    """
+    Decodes response bodies with the fastest available decoder, on the event loop for
+    the usual few-KB payloads and in the executor for large ones or ones that proved slow.
+    Both raise ValueError subclasses on invalid JSON.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str | None = None):
+        self._hass = hass
+        self.name = name or next(iter(DECODERS))
+        self._loads = DECODERS[self.name]
+        # Smallest body size decoded in the executor; lowered when a loop decode runs over budget.
+        self.offload_from = DECODE_EXECUTOR_BYTES
+        self._times: deque[float] = deque(maxlen=TELEMETRY_WINDOW)
+        self.max_seconds = 0.0
+        self.decodes = 0
+        self.offloaded = 0
+
+    async def async_decode(self, body: bytes) -> Any:
+        if len(body) >= self.offload_from:
+            data, seconds = await self._hass.async_add_executor_job(self._timed, body)
+            self.offloaded += 1
+        else:
+            data, seconds = self._timed(body)
+            if seconds > DECODE_LOOP_BUDGET:
+                self.offload_from = len(body)
+        self.decodes += 1
+        self._times.append(seconds)
+        self.max_seconds = max(self.max_seconds, seconds)
+        return data
+
+    def _timed(self, body: bytes) -> tuple[Any, float]:
+        started = time.perf_counter()
+        data = self._loads(body)
+        return data, time.perf_counter() - started
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "decoder": self.name,
+            "decodes": self.decodes,
+            "offloaded": self.offloaded,
+            "offload_from_bytes": self.offload_from,
+            "mean_ms": round(sum(self._times) / len(self._times) * 1000, 3) if self._times else None,
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
@@ -0,0 +1,72 @@
+from __future__ import annotations
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_TOKEN, DATA_FLEET
+from .coordinator import StokerCloudCoordinator
+
+TO_REDACT = {CONF_TOKEN}
+
+
+def _rate(hits: int, total: int) -> float | None:
+    return round(hits / total, 3) if total else None
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    coordinator: StokerCloudCoordinator = hass.data[DOMAIN][entry.entry_id]
+    api = coordinator.api
+    fleet = hass.data[DOMAIN].get(DATA_FLEET)
+    data = coordinator.data
+
+    # Every read either hit the cache, joined an in-flight request, or sent its own.
+    reads = api.cache_hits + api.cache_stale_hits + api.requests_coalesced + api.requests_sent
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "screen": api.screen,
+        "tier_screens": {tier: {"screen": screen, "interval": interval} for tier, screen, interval in api.tier_screens},
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+            "poll_interval": coordinator.poll_interval,
+            "poll_mode": coordinator.poll_mode,
+            "setup_seconds": coordinator.setup_seconds,
+            "first_data_seconds": coordinator.first_data_seconds,
+            "restored_from": coordinator.restored_from.isoformat() if coordinator.restored_from else None,
+            "last_cycle_seconds": coordinator.last_cycle_seconds,
+            "cycle_overruns": coordinator.cycle_overruns,
+            "write_status": coordinator.write_status,
+        },
+        "reads": api.read_stats.as_dict(),
+        "decode": api.decoder.as_dict(),
+        "writes": api.write_stats.as_dict(),
+        "cache": {
+            "requests_sent": api.requests_sent,
+            "requests_coalesced": api.requests_coalesced,
+            "hits": api.cache_hits,
+            "stale_hits": api.cache_stale_hits,
+            "hit_rate": _rate(api.cache_hits + api.cache_stale_hits, reads),
+            "coalesced_rate": _rate(api.requests_coalesced, reads),
+        },
+        "breaker": {
+            "state": api.breaker.state,
+            "failures_in_a_row": api.breaker.failures,
+            "retry_at": api.breaker.open_until.isoformat() if api.breaker.open_until else None,
+            "trips": api.breaker.trips,
+            "short_circuited": api.requests_short_circuited,
+        },
+        "write_queue": {"submitted": api.writes.submitted, "sent": api.writes.sent},
+        "command_queue": api.outbox.as_dict(),
+        "fleet": None if fleet is None else {
+            "slot_wait": fleet.slot_wait.get(entry.entry_id),
+            "max_slot_wait": fleet.max_slot_wait.get(entry.entry_id),
+            "schedule_lag": fleet.schedule_lag.get(entry.entry_id),
+        },
+        "snapshot": None if data is None else {
+            "fetched_at": data.fetched_at.isoformat() if data.fetched_at else None,
+            "stale": data.stale,
+            "values": data.values,
+        },
+    }
@@ -0,0 +1,61 @@
+from __future__ import annotations
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, ATTR_MANUFACTURER, CONF_SERIAL, CONF_NAME
+from .coordinator import StokerCloudCoordinator
+
+
+class StokerCloudEntity(CoordinatorEntity[StokerCloudCoordinator]):
+    """Base entity reading one value from the shared coordinator data."""
+
+    _attr_has_entity_name = True
+    # Key in the snapshot values (see fields.FIELDS).
+    _value_key: str
+
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator, unique_suffix: str):
+        super().__init__(coordinator)
+        self._entry = entry
+        self._serial = entry.data.get(CONF_SERIAL, "unknown")
+        self._attr_unique_id = f"{self._serial}_{unique_suffix}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self._serial)},
+            manufacturer=ATTR_MANUFACTURER,
+            name=entry.data.get(CONF_NAME) or f"NBE {self._serial}",
+            model="StokerCloud",
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        changed = self.coordinator.changed_keys
+        if changed is not None and not self._is_affected(changed):
+            return
+        self._write_coordinator_state()
+
+    @callback
+    def _write_coordinator_state(self) -> None:
+        with self.coordinator.api.profiler.span("entity_state_write"):
+            super()._handle_coordinator_update()
+
+    def _is_affected(self, changed: set[str]) -> bool:
+        """Whether a refresh that changed these snapshot values changes this entity's state."""
+        return self._value_key in changed
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        data = self.coordinator.data
+        if data is None:
+            return None
+        # True while the last good payload is served because StokerCloud did not answer.
+        return {"stale": data.stale}
+
+    @property
+    def value(self) -> Any:
+        data = self.coordinator.data
+        if data is None:
+            return None
+        return data.get(self._value_key)
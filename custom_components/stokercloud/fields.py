@@ -0,0 +1,241 @@
+from __future__ import annotations
+from collections.abc import Iterable
+
+from .const import TIER_FAST, TIER_NORMAL, TIER_SLOW, TIER_INTERVALS
+from .snapshot import ControllerSnapshot, SnapshotItem, to_number
+
+# Snapshot value read by each entity, keyed by its unique_id suffix ({serial}_{suffix}).
+ENTITY_FIELDS: dict[str, str] = {
+    # sensor
+    "boiler_temperature": "boiler_temperature",
+    "external_temperature": "external_temperature",
+    "wanted_boiler_temperature": "wanted_boiler_temperature",
+    "dhw_temperature": "dhw_temperature",
+    "dhw_wanted_temperature": "dhw_wanted_temperature",
+    "shaft_temperature": "shaft_temperature",
+    "power_kw": "power_kw",
+    "power_percent": "power_percent",
+    "pump_state": "pump_state",
+    "oxygen": "oxygen",
+    "hopper_consumption_24h": "hopper_consumption_24h",
+    "state": "state",
+    "photo_lux": "photo_lux",
+    "hopper_content_sensor": "hopper_content",
+    "dhw_difference_under_sensor": "dhw_difference_under",
+    # number
+    "boiler_temp_setpoint": "wanted_boiler_temperature",
+    "hopper_content": "hopper_content",
+    "dhw_difference_under": "dhw_difference_under",
+    # binary_sensor
+    "boiler_running": "boiler_running",
+    # switch
+    "boiler_power": "boiler_running",
+}
+
+
+
+# ---------------------------
+# Field registry: every platform value, defined once
+# ---------------------------
+
+class Item:
+    """{"id": ..., "value": ...} element by section and id, e.g. Item("boilerdata", "7")."""
+
+    __slots__ = ("section", "item_id")
+
+    def __init__(self, section: str, item_id: str):
+        self.section = section
+        self.item_id = item_id
+
+    def find(self, snap: ControllerSnapshot, selection: str | None):
+        return snap.items.get((self.section, self.item_id))
+
+
+class Path:
+    """Value at a dict path, e.g. Path("miscdata", "state", "value")."""
+
+    __slots__ = ("keys",)
+
+    def __init__(self, *keys: str):
+        self.keys = keys
+
+    def find(self, snap: ControllerSnapshot, selection: str | None):
+        return snap.path(*self.keys)
+
+
+class Slot:
+    """The item in the screen slot the field was given (e.g. selection "hopper1")."""
+
+    __slots__ = ()
+
+    def find(self, snap: ControllerSnapshot, selection: str | None):
+        return snap.selections.get(selection) if selection else None
+
+
+def _running(raw) -> bool | None:
+    """miscdata.running → True/False."""
+    # We treat 1 / "1" / True as ON.
+    s = str(raw).strip().lower()
+    if s in ("1", "true", "on", "yes"):
+        return True
+    if s in ("0", "false", "off", "no"):
+        return False
+    # if it’s a number/float, we treat values > 0 as True
+    try:
+        return float(s) > 0
+    except ValueError:
+        return None
+
+
+def _code(raw) -> str | None:
+    """Raw state code, e.g. 'state_5'."""
+    return str(raw) if raw else None
+
+
+def _upper(raw) -> str | None:
+    """'on' → 'ON'."""
+    return str(raw).upper()
+
+
+class Field:
+    """
+    One platform value: sources tried in order until one yields a value (the fallback chain),
+    the parser for the raw value, the screen slot (section letter, id) it needs, if any,
+    the cadence tier that slot is polled at, and the unit its sensor shows.
+    """
+
+    __slots__ = ("key", "sources", "parser", "slot", "unit", "tier")
+
+    def __init__(self, key: str, *sources, parser=to_number, slot: tuple[str, str] | None = None,
+                 unit: str | None = None, tier: str = TIER_FAST):
+        self.key = key
+        self.sources = sources
+        self.parser = parser
+        self.slot = slot
+        self.unit = unit
+        self.tier = tier
+
+    def extract(self, snap: ControllerSnapshot, selection: str | None = None):
+        for source in self.sources:
+            found = source.find(snap, selection)
+            if found is None:
+                continue
+            if isinstance(found, SnapshotItem):
+                # Numbers were converted once when the payload was indexed.
+                value = found.number if self.parser is to_number else self.parser(found.raw)
+            else:
+                value = self.parser(found)
+            if value is not None:
+                return value
+        return None
+
+
+# Slots are the section letter (b=boilerdata, d=dhwdata, h=hopperdata, w=weatherdata) and the
+# controller id shown in the slot. frontdata, miscdata, leftoutput and weathercomp come with every screen.
+# Slow-moving slots sit in a slower cadence tier (see build_tier_queries).
+FIELDS: tuple[Field, ...] = (
+    # Fallback: weathercomp.zone1-actual (sometimes equal to the actual temperature)
+    Field("boiler_temperature", Item("frontdata", "boilertemp"), Path("weathercomp", "zone1-actual", "val"),
+          unit="°C"),
+    # lng_weather_7; fallback: weathercomp.zone1-actualref
+    Field("external_temperature", Item("weatherdata", "7"), Path("weathercomp", "zone1-actualref", "val"),
+          slot=("w", "7"), unit="°C", tier=TIER_NORMAL),
+    Field("wanted_boiler_temperature", Item("frontdata", "-wantedboilertemp"), unit="°C"),
+    Field("dhw_temperature", Item("frontdata", "dhw"), unit="°C"),
+    Field("dhw_wanted_temperature", Item("frontdata", "dhwwanted"), unit="°C"),
+    # lng_dhw_3; a setting, changed a few times a day at most
+    Field("dhw_difference_under", Item("dhwdata", "3"), slot=("d", "3"), unit="°C", tier=TIER_SLOW),
+    Field("shaft_temperature", Item("boilerdata", "7"), slot=("b", "7"), unit="°C"),  # lng_boil_7
+    Field("boiler_running", Path("miscdata", "running"), parser=_running),
+    Field("power_kw", Path("miscdata", "output"), unit="kW"),
+    Field("power_percent", Path("miscdata", "outputpct"), unit="%"),
+    Field("photo_lux", Item("boilerdata", "6"), slot=("b", "6"), unit="lx"),
+    Field("state", Path("miscdata", "state", "value"), parser=_code),
+    Field("pump_state", Path("leftoutput", "output-2", "val"), parser=_upper),
+    Field("oxygen", Item("boilerdata", "12"), slot=("b", "12"), unit="%"),
+    # Consumption over the last 24 h: by id, else whatever the hopper slot shows.
+    Field("hopper_consumption_24h", Item("hopperdata", "3"), Slot(), slot=("h", "3"), unit="kg",
+          tier=TIER_SLOW),
+    Field("hopper_content", Item("frontdata", "hoppercontent"), unit="kg"),
+)
+
+FIELDS_BY_KEY: dict[str, Field] = {field.key: field for field in FIELDS}
+
+# Screen slot each value needs (see build_screen_query).
+SCREEN_SLOTS: dict[str, tuple[str, str]] = {field.key: field.slot for field in FIELDS if field.slot}
+
+_SECTION_SELECTION = {"b": "boiler", "d": "dhw", "h": "hopper", "w": "weather"}
+
+# Used when no value needs a slot: one empty slot, as in the DevTools screens.
+EMPTY_SCREEN_QUERY = "b1,0"
+
+
+def fields_for_entities(unique_suffixes: Iterable[str] | None) -> set[str]:
+    """Snapshot values needed by the given entities (None = every entity)."""
+    if unique_suffixes is None:
+        return set(ENTITY_FIELDS.values())
+    return {ENTITY_FIELDS[s] for s in unique_suffixes if s in ENTITY_FIELDS}
+
+
+def build_screen_query(fields: Iterable[str], offsets: dict[str, int] | None = None) -> tuple[str, dict[str, str]]:
+    """
+    Minimal screen query for the given values, e.g. "b1,7,b2,12,d1,3".
+    Also returns the selection each value lands in (e.g. "boiler2"), as the controller names it.
+    offsets: slots per section already taken by another screen; numbering continues after them.
+    """
+    fields = set(fields)
+    offsets = offsets or {}
+    slots = _screen_slots(fields)
+    selections = {
+        key: f"{_SECTION_SELECTION[letter]}{offsets.get(letter, 0) + slots[letter].index(item_id) + 1}"
+        for key, (letter, item_id) in SCREEN_SLOTS.items()
+        if letter in slots and item_id in slots[letter] and key in fields
+    }
+    parts = [
+        f"{letter}{n},{item_id}"
+        for letter in _SECTION_SELECTION
+        for n, item_id in enumerate(slots.get(letter, ()), start=offsets.get(letter, 0) + 1)
+    ]
+    return (",".join(parts) or EMPTY_SCREEN_QUERY), selections
+
+
+def _screen_slots(fields: Iterable[str]) -> dict[str, list[str]]:
+    # Item ids per section letter, in SCREEN_SLOTS order.
+    wanted = set(fields)
+    slots: dict[str, list[str]] = {}
+    for key, (letter, item_id) in SCREEN_SLOTS.items():
+        if key in wanted and item_id not in (ids := slots.setdefault(letter, [])):
+            ids.append(item_id)
+    return slots
+
+
+def build_tier_queries(fields: Iterable[str]) -> list[tuple[str, str, dict[str, str]]]:
+    """
+    (tier, screen query, selections) per cadence tier, fast first. The fast screen is always
+    fetched (it carries frontdata and miscdata); slower tiers only when they have slots to fill.
+    Slot numbers continue across tiers, so every selection is unique in the merged snapshot.
+    """
+    by_tier: dict[str, set[str]] = {TIER_FAST: set()}
+    for key in fields:
+        field = FIELDS_BY_KEY.get(key)
+        tier = field.tier if field is not None and field.slot else TIER_FAST
+        by_tier.setdefault(tier, set()).add(key)
+    queries = []
+    offsets: dict[str, int] = {}
+    for tier in (TIER_FAST, *TIER_INTERVALS):
+        if tier == TIER_FAST or by_tier.get(tier):
+            keys = by_tier.get(tier, set())
+            queries.append((tier, *build_screen_query(keys, offsets)))
+            # EMPTY_SCREEN_QUERY takes boiler1.
+            for letter, ids in (_screen_slots(keys) or {"b": ["0"]}).items():
+                offsets[letter] = offsets.get(letter, 0) + len(ids)
+    return queries
+
+
+def build_snapshot(snap: ControllerSnapshot, selections: dict[str, str]) -> ControllerSnapshot:
+    """
+    Fill snap.values with every registered field (dict hits on the indexed payload only).
+    selections: slot name each value was placed in by the screen query, e.g. "hopper1".
+    """
+    snap.values = {field.key: field.extract(snap, selections.get(field.key)) for field in FIELDS}
+    return snap
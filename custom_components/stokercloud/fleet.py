@@ -0,0 +1,52 @@
+from __future__ import annotations
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+
+class StokerCloudFleet:
+    """
+    Domain-wide scheduler shared by every config entry (hass.data[DOMAIN][DATA_FLEET]).
+    Spreads the entries' polls evenly across the poll interval and caps how many
+    requests to stokercloud.dk run at the same time.
+    """
+
+    def __init__(self, max_concurrent: int):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self._entries: list[str] = []
+        # Per entry: last/max time spent waiting for a request slot, and how late the last poll started.
+        self.slot_wait: dict[str, float] = {}
+        self.max_slot_wait: dict[str, float] = {}
+        self.schedule_lag: dict[str, float] = {}
+
+    def async_register(self, entry_id: str) -> Callable[[], None]:
+        self._entries.append(entry_id)
+
+        def _unregister() -> None:
+            self._entries.remove(entry_id)
+            for stats in (self.slot_wait, self.max_slot_wait, self.schedule_lag):
+                stats.pop(entry_id, None)
+
+        return _unregister
+
+    def next_poll(self, entry_id: str, now: float, interval: float) -> float:
+        """Time (loop clock) of the next poll, moved onto this entry's phase within the interval."""
+        if entry_id not in self._entries or len(self._entries) < 2:
+            return now + interval
+        phase = interval * self._entries.index(entry_id) / len(self._entries)
+        target = now + interval
+        shift = (phase - target) % interval
+        # Move by at most half an interval, earlier or later, so polls converge onto the phase.
+        if shift > interval / 2:
+            shift -= interval
+        return target + shift
+
+    @asynccontextmanager
+    async def request_slot(self, entry_id: str) -> AsyncIterator[None]:
+        started = time.monotonic()
+        async with self.semaphore:
+            waited = time.monotonic() - started
+            self.slot_wait[entry_id] = waited
+            self.max_slot_wait[entry_id] = max(waited, self.max_slot_wait.get(entry_id, 0.0))
+            yield
@@ -0,0 +1,181 @@
+from __future__ import annotations
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    COMMAND_STORAGE_KEY, COMMAND_STORAGE_VERSION, COMMAND_RETRY_BASE, COMMAND_RETRY_MAX, COMMAND_EXPIRY,
+    COMMAND_EXPIRY_SHORT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class QueuedCommand:
+    __slots__ = ("value", "queued_at", "attempts", "retry_at")
+
+    def __init__(self, value: Any, queued_at: datetime, attempts: int, retry_at: datetime):
+        self.value = value
+        self.queued_at = queued_at
+        self.attempts = attempts
+        self.retry_at = retry_at
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "value": self.value,
+            "queued_at": self.queued_at.isoformat(),
+            "attempts": self.attempts,
+            "retry_at": self.retry_at.isoformat(),
+        }
+
+
+class CommandOutbox:
+    """
+    Writes that failed because stokercloud.dk was unreachable, kept in .storage per entry and
+    retried with exponential backoff until delivered or COMMAND_EXPIRY (COMMAND_EXPIRY_SHORT for
+    e.g. boiler start/stop) passes. One command per parameter: a newer value replaces the queued
+    one, and a later successful write settles it.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, title: str, send: Callable[[str, Any], Awaitable[bool]]):
+        self._hass = hass
+        self._title = title
+        self._send = send
+        self._store: Store[dict[str, Any]] = Store(hass, COMMAND_STORAGE_VERSION, COMMAND_STORAGE_KEY.format(entry_id))
+        self.commands: dict[str, QueuedCommand] = {}
+        self._unsub_retry: CALLBACK_TYPE | None = None
+        self._listeners: list[Callable[[], None]] = []
+        self._delivery_listeners: list[Callable[[str, Any], None]] = []
+        self._pending_save = False
+        self.delivered = 0
+        self.expired = 0
+
+    async def async_load(self) -> None:
+        """Pick up the commands queued before a restart; the first retry follows shortly."""
+        try:
+            stored = await self._store.async_load() or {}
+            now = dt_util.utcnow()
+            for name, cmd in stored.get("commands", {}).items():
+                self.commands[name] = QueuedCommand(
+                    cmd["value"], datetime.fromisoformat(cmd["queued_at"]), int(cmd["attempts"]),
+                    now + timedelta(seconds=COMMAND_RETRY_BASE),
+                )
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("%s: ignoring unreadable queued commands: %s", self._title, err)
+            self.commands.clear()
+        self._expire(dt_util.utcnow())
+        self._schedule()
+
+    def async_add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener whenever the queue changes."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def async_add_delivery_listener(self, listener: Callable[[str, Any], None]) -> Callable[[], None]:
+        """Call listener(name, value) when a queued command finally reaches the boiler."""
+        self._delivery_listeners.append(listener)
+        return lambda: self._delivery_listeners.remove(listener)
+
+    @property
+    def oldest(self) -> datetime | None:
+        return min((cmd.queued_at for cmd in self.commands.values()), default=None)
+
+    @callback
+    def add(self, name: str, value: Any, sent: bool = True) -> None:
+        """
+        Queue (or re-queue after another failed attempt) the latest value of a parameter.
+        sent=False: the write never left (breaker open); it is not counted and does not grow the backoff.
+        """
+        now = dt_util.utcnow()
+        cmd = self.commands.get(name)
+        if cmd is None or cmd.value != value:
+            _LOGGER.warning("%s: %s=%s queued, will retry until it reaches the boiler", self._title, name, value)
+            cmd = self.commands[name] = QueuedCommand(value, now, 0, now)
+        if sent:
+            cmd.attempts += 1
+        backoff = COMMAND_RETRY_BASE * 2 ** max(0, cmd.attempts - 1)
+        cmd.retry_at = now + timedelta(seconds=min(COMMAND_RETRY_MAX, backoff))
+        self._changed()
+
+    @callback
+    def discard(self, name: str) -> None:
+        """A write of this parameter went through: nothing left to retry."""
+        if self.commands.pop(name, None) is not None:
+            self._changed()
+
+    def _changed(self) -> None:
+        self._pending_save = True
+        self._store.async_delay_save(self._data_to_save, 1)
+        self._schedule()
+        for listener in list(self._listeners):
+            listener()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        self._pending_save = False
+        return {"commands": {name: cmd.as_dict() for name, cmd in self.commands.items()}}
+
+    def _schedule(self) -> None:
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+        if not self.commands:
+            return
+        delay = (min(cmd.retry_at for cmd in self.commands.values()) - dt_util.utcnow()).total_seconds()
+        self._unsub_retry = async_call_later(self._hass, max(0.0, delay), self._retry_due)
+
+    @callback
+    def _retry_due(self, _now: datetime) -> None:
+        self._unsub_retry = None
+        self._hass.async_create_task(self._async_retry())
+
+    async def _async_retry(self) -> None:
+        now = dt_util.utcnow()
+        self._expire(now)
+        for name, cmd in list(self.commands.items()):
+            if cmd.retry_at > now:
+                continue
+            # The write path calls add() or discard() with the outcome.
+            if await self._send(name, cmd.value):
+                self.delivered += 1
+                _LOGGER.info("%s: queued %s=%s delivered after %s attempt(s)", self._title, name, cmd.value, cmd.attempts + 1)
+                for listener in list(self._delivery_listeners):
+                    listener(name, cmd.value)
+            elif self.commands.get(name) is cmd and cmd.retry_at <= now:
+                # Failed without an outcome (e.g. the send raised): back off, never retry at once.
+                self.add(name, cmd.value)
+        self._schedule()
+
+    def _expire(self, now: datetime) -> None:
+        for name, cmd in list(self.commands.items()):
+            if now - cmd.queued_at > timedelta(seconds=COMMAND_EXPIRY_SHORT.get(name, COMMAND_EXPIRY)):
+                self.expired += 1
+                _LOGGER.warning("%s: giving up on %s=%s after %s attempt(s)", self._title, name, cmd.value, cmd.attempts)
+                self.discard(name)
+
+    async def async_shutdown(self) -> None:
+        """Stop retrying and write the queue now (entry unload); it is picked up on the next setup."""
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+        if self._pending_save:
+            await self._store.async_save(self._data_to_save())
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "depth": len(self.commands),
+            "oldest": self.oldest.isoformat() if self.oldest else None,
+            "delivered": self.delivered,
+            "expired": self.expired,
+            "commands": {name: cmd.as_dict() for name, cmd in self.commands.items()},
+        }
+
+
+async def async_remove_commands(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the stored queue of a removed entry."""
+    await Store(hass, COMMAND_STORAGE_VERSION, COMMAND_STORAGE_KEY.format(entry_id)).async_remove()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+import time
+from contextlib import AbstractContextManager, nullcontext
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DATA_PROFILER
+
+# Returned while profiling is off: one shared no-op context manager, no allocation per span.
+_NO_SPAN = nullcontext()
+
+
+class _Span:
+    __slots__ = ("_profiler", "_name", "_started")
+
+    def __init__(self, profiler: Profiler, name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self._profiler.record(self._name, time.perf_counter() - self._started)
+
+
+class Profiler:
+    """
+    Opt-in timing spans around the update and write paths, shared by all boilers
+    (stokercloud.start_profiling / stop_profiling). Spans are aggregated per name.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.started: datetime | None = None
+        # name → [count, total seconds, max seconds]
+        self._spans: dict[str, list[float]] = {}
+
+    def span(self, name: str) -> AbstractContextManager[None]:
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, seconds: float) -> None:
+        if (agg := self._spans.get(name)) is None:
+            self._spans[name] = [1, seconds, seconds]
+            return
+        agg[0] += 1
+        agg[1] += seconds
+        if seconds > agg[2]:
+            agg[2] = seconds
+
+    def start(self) -> None:
+        self._spans.clear()
+        self.started = datetime.now(timezone.utc)
+        self.enabled = True
+
+    def stop(self) -> dict[str, Any]:
+        """Stop recording and return the aggregated spans, largest total first."""
+        self.enabled = False
+        stopped = datetime.now(timezone.utc)
+        spans = {
+            name: {
+                "count": int(count),
+                "total_ms": round(total * 1000, 3),
+                "mean_ms": round(total / count * 1000, 3),
+                "max_ms": round(peak * 1000, 3),
+            }
+            for name, (count, total, peak) in sorted(self._spans.items(), key=lambda kv: -kv[1][1])
+        }
+        return {
+            "started": self.started.isoformat() if self.started else None,
+            "stopped": stopped.isoformat(),
+            "seconds": round((stopped - self.started).total_seconds(), 3) if self.started else None,
+            "spans": spans,
+        }
+
+
+def get_profiler(hass: HomeAssistant) -> Profiler:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (profiler := domain_data.get(DATA_PROFILER)) is None:
+        profiler = domain_data[DATA_PROFILER] = Profiler()
+    return profiler
@@ -1,341 +1,171 @@
 from __future__ import annotations
 import logging
-from datetime import timedelta
+import time
 
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
-from homeassistant.const import UnitOfTemperature, UnitOfPower, UnitOfMass, PERCENTAGE
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, CoordinatorEntity
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.const import UnitOfTime
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, ATTR_MANUFACTURER, CONF_SERIAL, CONF_NAME, BOILER_SCAN_INTERVAL
-from .api import StokerCloudWriteApi
-
-# fallback for illuminance units (if needed)
-try:
-    from homeassistant.const import UnitOfIlluminance
-    ILLUM_UNIT = UnitOfIlluminance.LUX
-except Exception:
-    ILLUM_UNIT = "lx"
+from .breaker import BREAKER_STATES
+from .const import DOMAIN
+from .coordinator import StokerCloudCoordinator
+from .deadband import deadband_for
+from .fields import FIELDS_BY_KEY
+from .entity import StokerCloudEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
-    api: StokerCloudWriteApi = hass.data[DOMAIN][entry.entry_id]
-
-    async def _upd_boiler():
-        return await api.async_get_boiler_temperature_from_controller()
-
-    async def _upd_external():
-        return await api.async_get_external_temperature_from_controller()
-
-    async def _upd_wanted_boiler():
-        return await api.async_get_wanted_boiler_temp_from_controller()
-
-    async def _upd_dhw():
-        return await api.async_get_dhw_temperature_from_controller()
-
-    async def _upd_dhw_wanted():
-        return await api.async_get_dhw_wanted_temperature_from_controller()
-
-    async def _upd_shaft():
-        return await api.async_get_shaft_temperature_from_controller()
-
-    async def _upd_output_kw():
-        return await api.async_get_output_kw_from_controller()
+    coordinator: StokerCloudCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async def _upd_output_pct():
-        return await api.async_get_output_pct_from_controller()
-
-    # NEW: raw state code (miscdata.state.value), e.g. 'state_5'
-    async def _upd_state_code():
-        return await api.async_get_state_code_from_controller()
-
-    # (optional) photo sensor lux, if you use it
-    async def _upd_photo_lux():
-        try:
-            if hasattr(api, "async_get_photo_sensor_lux_from_controller"):
-                return await api.async_get_photo_sensor_lux_from_controller()
-        except Exception as e:
-            _LOGGER.debug("Photo sensor update failed: %s", e)
-        return None
-    
-    async def _upd_pump_state():
-        return await api.async_get_pump_state_from_controller()
-    
-    async def _upd_oxygen():
-        return await api.async_get_oxygen_from_controller()
-    
-    async def _upd_hopper_cons_24h():
-        return await api.async_get_hopper_consumption_24h_kg()
-
-    # --- NEW: Update hopper remaining amount (kg) for the sensor ---
-    async def _upd_hopper_content():
-        return await api.async_get_hopper_content_kg()
-
-    async def _upd_dhw_difference_under():
-        return await api.async_get_dhw_difference_under_from_controller()
-
-    boiler_coord = DataUpdateCoordinator[float | None](
-        hass, _LOGGER, name=f"{DOMAIN}_boiler_temp",
-        update_method=_upd_boiler,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
-    external_coord = DataUpdateCoordinator[float | None](
-        hass, _LOGGER, name=f"{DOMAIN}_external_temp",
-        update_method=_upd_external,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
-    wanted_boiler_coord = DataUpdateCoordinator[float | None](
-        hass, _LOGGER, name=f"{DOMAIN}_wanted_boiler_temp",
-        update_method=_upd_wanted_boiler,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
-    dhw_coord = DataUpdateCoordinator[float | None](
-        hass, _LOGGER, name=f"{DOMAIN}_dhw_temp",
-        update_method=_upd_dhw,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
-    dhw_wanted_coord = DataUpdateCoordinator[float | None](
-        hass, _LOGGER, name=f"{DOMAIN}_dhw_wanted_temp",
-        update_method=_upd_dhw_wanted,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
-    shaft_coord = DataUpdateCoordinator[float | None](
-        hass, _LOGGER, name=f"{DOMAIN}_shaft_temp",
-        update_method=_upd_shaft,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
-    output_kw_coord = DataUpdateCoordinator[float | None](
-        hass, _LOGGER, name=f"{DOMAIN}_output_kw",
-        update_method=_upd_output_kw,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
-    output_pct_coord = DataUpdateCoordinator[float | None](
-        hass, _LOGGER, name=f"{DOMAIN}_output_pct",
-        update_method=_upd_output_pct,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
+    async_add_entities(
+        [
+            BoilerTemperatureSensor(entry, coordinator),
+            ExternalTemperatureSensor(entry, coordinator),
+            WantedBoilerTemperatureSensor(entry, coordinator),
+            DhwTemperatureSensor(entry, coordinator),
+            DhwWantedTemperatureSensor(entry, coordinator),
+            ShaftTemperatureSensor(entry, coordinator),
+            OutputPowerKwSensor(entry, coordinator),
+            OutputPowerPercentSensor(entry, coordinator),
+            PumpStateSensor(entry, coordinator),
+            OxygenSensor(entry, coordinator),
+            HopperConsumption24hSensor(entry, coordinator),
+            StateTextSensor(entry, coordinator),
+            PhotoIlluminanceSensor(entry, coordinator),
+            HopperContentSensor(entry, coordinator),
+            DhwDifferenceUnder(entry, coordinator),
+            FetchLatencySensor(entry, coordinator),
+            FetchFailuresSensor(entry, coordinator),
+            LastGoodPayloadSensor(entry, coordinator),
+            CloudConnectionSensor(entry, coordinator),
+            CommandQueueDepthSensor(entry, coordinator),
+            CommandQueueAgeSensor(entry, coordinator),
+        ]
     )
 
-    # NEW: coordinator for the state code
-    state_code_coord = DataUpdateCoordinator[str | None](
-        hass, _LOGGER, name=f"{DOMAIN}_state_code",
-        update_method=_upd_state_code,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
 
-    # (optional) lux from photo sensor
-    photo_lux_coord = DataUpdateCoordinator[float | None](
-        hass, _LOGGER, name=f"{DOMAIN}_photo_lux",
-        update_method=_upd_photo_lux,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
-    pump_state_coord = DataUpdateCoordinator[str | None](
-        hass, _LOGGER, name=f"{DOMAIN}_pump_state",
-        update_method=_upd_pump_state,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
-    oxygen_coord = DataUpdateCoordinator[float | None](
-        hass, _LOGGER, name=f"{DOMAIN}_oxygen",
-        update_method=_upd_oxygen,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
-    hopper_cons_24h_coord = DataUpdateCoordinator[float | None](
-        hass,
-        _LOGGER,
-        name=f"{DOMAIN}_hopper_cons_24h",
-        update_method=_upd_hopper_cons_24h,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
-    
-    # --- NEW: Hopper content coordinator ---
-    hopper_content_coord = DataUpdateCoordinator[float | None](
-        hass,
-        _LOGGER,
-        name=f"{DOMAIN}_hopper_content_sensor",
-        update_method=_upd_hopper_content,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
-
-    dhw_difference_under_coord = DataUpdateCoordinator[float | None](
-        hass,
-        _LOGGER,
-        name=f"{DOMAIN}_dhw_difference_under_sensor",
-        update_method=_upd_dhw_difference_under,
-        update_interval=timedelta(seconds=BOILER_SCAN_INTERVAL),
-    )
+class _StokerCloudSensor(StokerCloudEntity, SensorEntity):
+    # Deadband option group (const.DEADBAND_OPTIONS) this sensor is filtered by, if any.
+    _deadband_class: str | None = None
+
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator, unique_suffix: str):
+        super().__init__(entry, coordinator, unique_suffix)
+        self._deadband = deadband_for(entry.options, self._deadband_class)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self._deadband is not None:
+            self._deadband.accept(self.value, time.monotonic(), force=True)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        changed = self.coordinator.changed_keys
+        if self._deadband is None:
+            super()._handle_coordinator_update()
+            return
+        if changed is not None and not self._is_affected(changed):
+            return
+        if not self._deadband.accept(self.value, time.monotonic(), force=changed is None):
+            # Inside the band: keep showing the published value, skip the state write.
+            return
+        self._write_coordinator_state()
+
+    def _is_affected(self, changed: set[str]) -> bool:
+        # A value held back by the band is checked on every refresh, so max_silence can publish it.
+        return super()._is_affected(changed) or (self._deadband is not None and self._deadband.value != self.value)
 
-    await boiler_coord.async_config_entry_first_refresh()
-    await external_coord.async_config_entry_first_refresh()
-    await wanted_boiler_coord.async_config_entry_first_refresh()
-    await dhw_coord.async_config_entry_first_refresh()
-    await dhw_wanted_coord.async_config_entry_first_refresh()
-    await shaft_coord.async_config_entry_first_refresh()
-    await output_kw_coord.async_config_entry_first_refresh()
-    await output_pct_coord.async_config_entry_first_refresh()
-
-    await state_code_coord.async_config_entry_first_refresh()
-    await photo_lux_coord.async_config_entry_first_refresh()
-    await pump_state_coord.async_config_entry_first_refresh()
-    await oxygen_coord.async_config_entry_first_refresh()
-    await hopper_cons_24h_coord.async_config_entry_first_refresh()
-    
-    # --- NEW: Initial update ---
-    await hopper_content_coord.async_config_entry_first_refresh()
-
-    await dhw_difference_under_coord.async_config_entry_first_refresh()
+    @property
+    def native_value(self):
+        return self.value if self._deadband is None else self._deadband.value
 
-    async_add_entities(
-        [
-            BoilerTemperatureSensor(entry, boiler_coord),
-            ExternalTemperatureSensor(entry, external_coord),
-            WantedBoilerTemperatureSensor(entry, wanted_boiler_coord),
-            DhwTemperatureSensor(entry, dhw_coord),
-            DhwWantedTemperatureSensor(entry, dhw_wanted_coord),
-            ShaftTemperatureSensor(entry, shaft_coord),
-            OutputPowerKwSensor(entry, output_kw_coord),
-            OutputPowerPercentSensor(entry, output_pct_coord),
-            PumpStateSensor(entry, pump_state_coord),
-            OxygenSensor(entry, oxygen_coord),
-            HopperConsumption24hSensor(entry, hopper_cons_24h_coord),
-            StateTextSensor(entry, state_code_coord),
-            PhotoIlluminanceSensor(entry, photo_lux_coord),
-            
-            # --- NEW: Add sensor ---
-            HopperContentSensor(entry, hopper_content_coord),
-
-            DhwDifferenceUnder(entry, dhw_difference_under_coord),
-        ],
-        True,
-    )
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        # Declared once, on the value's Field in fields.py.
+        field = FIELDS_BY_KEY.get(self._value_key)
+        return field.unit if field is not None else None
 
 
-class _BaseTempSensor(CoordinatorEntity[DataUpdateCoordinator[float | None]], SensorEntity):
+class _BaseTempSensor(_StokerCloudSensor):
+    _deadband_class = "temperature"
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_icon = "mdi:thermometer"
-    _attr_has_entity_name = True
 
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None], unique_suffix: str, name: str):
-        super().__init__(coordinator)
-        serial = entry.data.get(CONF_SERIAL, "unknown")
-        dev_name = entry.data.get(CONF_NAME) or f"NBE {serial}"
-        self._attr_unique_id = f"{serial}_{unique_suffix}"
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator, unique_suffix: str, name: str):
+        super().__init__(entry, coordinator, unique_suffix)
+        self._value_key = unique_suffix
         self._attr_name = name
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, serial)},
-            manufacturer=ATTR_MANUFACTURER,
-            name=dev_name,
-            model="StokerCloud",
-        )
-
-    @property
-    def native_value(self) -> float | None:
-        return self.coordinator.data
 
 
 class BoilerTemperatureSensor(_BaseTempSensor):
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None]):
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
         super().__init__(entry, coordinator, "boiler_temperature", "Boiler temperature")
 
 
 class ExternalTemperatureSensor(_BaseTempSensor):
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None]):
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
         super().__init__(entry, coordinator, "external_temperature", "External temperature")
 
 
 class WantedBoilerTemperatureSensor(_BaseTempSensor):
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None]):
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
         super().__init__(entry, coordinator, "wanted_boiler_temperature", "Wanted boiler temperature")
 
 
 class DhwTemperatureSensor(_BaseTempSensor):
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None]):
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
         super().__init__(entry, coordinator, "dhw_temperature", "Hot water temperature")
 
 
 class DhwWantedTemperatureSensor(_BaseTempSensor):
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None]):
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
         super().__init__(entry, coordinator, "dhw_wanted_temperature", "Hot water wanted temperature")
 
 
 class ShaftTemperatureSensor(_BaseTempSensor):
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None]):
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
         super().__init__(entry, coordinator, "shaft_temperature", "Shaft temperature")
 
 
-class OutputPowerKwSensor(CoordinatorEntity[DataUpdateCoordinator[float | None]], SensorEntity):
+class OutputPowerKwSensor(_StokerCloudSensor):
     _attr_device_class = SensorDeviceClass.POWER
     _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = UnitOfPower.KILO_WATT
     _attr_icon = "mdi:flash"
-    _attr_has_entity_name = True
-
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None]):
-        super().__init__(coordinator)
-        serial = entry.data.get(CONF_SERIAL, "unknown")
-        dev_name = entry.data.get(CONF_NAME) or f"NBE {serial}"
-        self._attr_unique_id = f"{serial}_power_kw"
-        self._attr_name = "Power (kW)"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, serial)},
-            manufacturer=ATTR_MANUFACTURER,
-            name=dev_name,
-            model="StokerCloud",
-        )
+    _attr_name = "Power (kW)"
+    _deadband_class = "power"
+    _value_key = "power_kw"
 
-    @property
-    def native_value(self) -> float | None:
-        return self.coordinator.data
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "power_kw")
 
 
-class OutputPowerPercentSensor(CoordinatorEntity[DataUpdateCoordinator[float | None]], SensorEntity):
+class OutputPowerPercentSensor(_StokerCloudSensor):
     _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = PERCENTAGE
     _attr_icon = "mdi:percent"
-    _attr_has_entity_name = True
-
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None]):
-        super().__init__(coordinator)
-        serial = entry.data.get(CONF_SERIAL, "unknown")
-        dev_name = entry.data.get(CONF_NAME) or f"NBE {serial}"
-        self._attr_unique_id = f"{serial}_power_percent"
-        self._attr_name = "Power (%)"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, serial)},
-            manufacturer=ATTR_MANUFACTURER,
-            name=dev_name,
-            model="StokerCloud",
-        )
+    _attr_name = "Power (%)"
+    _deadband_class = "power"
+    _value_key = "power_percent"
 
-    @property
-    def native_value(self) -> float | None:
-        return self.coordinator.data
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "power_percent")
 
 
-class StateTextSensor(CoordinatorEntity[DataUpdateCoordinator[str | None]], SensorEntity):
-    _attr_has_entity_name = True
+class StateTextSensor(_StokerCloudSensor):
     _attr_icon = "mdi:flash"
+    _attr_name = "State"
+    _value_key = "state"
 
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[str | None]):
-        super().__init__(coordinator)
-        serial = entry.data.get(CONF_SERIAL, "unknown")
-        dev_name = entry.data.get(CONF_NAME) or f"NBE {serial}"
-        self._attr_unique_id = f"{serial}_state"
-        self._attr_name = "State"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, serial)},
-            manufacturer=ATTR_MANUFACTURER,
-            name=dev_name,
-            model="StokerCloud",
-        )
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "state")
 
     @property
     def native_value(self) -> str | None:
-        code = self.coordinator.data
+        code = self.value
         if not code:
             return None
         mapping = {
@@ -347,192 +177,271 @@ class StateTextSensor(CoordinatorEntity[DataUpdateCoordinator[str | None]], Sens
 
     @property
     def extra_state_attributes(self):
-        return {"raw_code": self.coordinator.data}
+        return {**(super().extra_state_attributes or {}), "raw_code": self.value}
 
 
-class PhotoIlluminanceSensor(CoordinatorEntity[DataUpdateCoordinator[float | None]], SensorEntity):
+class PhotoIlluminanceSensor(_StokerCloudSensor):
     _attr_device_class = SensorDeviceClass.ILLUMINANCE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_icon = "mdi:brightness-5"
-    _attr_has_entity_name = True
-    _attr_native_unit_of_measurement = ILLUM_UNIT
-
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None]):
-        super().__init__(coordinator)
-        serial = entry.data.get(CONF_SERIAL, "unknown")
-        dev_name = entry.data.get(CONF_NAME) or f"NBE {serial}"
-        self._attr_unique_id = f"{serial}_photo_lux"
-        self._attr_name = "Photo sensor"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, serial)},
-            manufacturer=ATTR_MANUFACTURER,
-            name=dev_name,
-            model="StokerCloud",
-        )
+    _attr_name = "Photo sensor"
+    _deadband_class = "illuminance"
+    _value_key = "photo_lux"
 
-    @property
-    def native_value(self) -> float | None:
-        return self.coordinator.data
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "photo_lux")
 
 
-class PumpStateSensor(CoordinatorEntity[DataUpdateCoordinator[str | None]], SensorEntity):
+class PumpStateSensor(_StokerCloudSensor):
     _attr_icon = "mdi:pump"
-    _attr_has_entity_name = True
-
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[str | None]):
-        super().__init__(coordinator)
-        serial = entry.data.get(CONF_SERIAL, "unknown")
-        dev_name = entry.data.get(CONF_NAME) or f"NBE {serial}"
-        self._attr_unique_id = f"{serial}_pump_state"
-        self._attr_name = "Pump State"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, serial)},
-            manufacturer=ATTR_MANUFACTURER,
-            name=dev_name,
-            model="StokerCloud",
-        )
+    _attr_name = "Pump State"
+    _value_key = "pump_state"
 
-    @property
-    def available(self) -> bool:
-        return self.coordinator.data is not None
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "pump_state")
 
     @property
-    def native_value(self) -> str | None:
-        val = self.coordinator.data
-        if val is None:
-            return None
-        return val
+    def available(self) -> bool:
+        return super().available and self.value is not None
 
     @property
     def extra_state_attributes(self):
-        return {"source_path": "leftoutput.output-2.val"}
+        return {**(super().extra_state_attributes or {}), "source_path": "leftoutput.output-2.val"}
 
 
-class OxygenSensor(CoordinatorEntity[DataUpdateCoordinator[float | None]], SensorEntity):
-    _attr_has_entity_name = True
+class OxygenSensor(_StokerCloudSensor):
     _attr_name = "Oxygen"
+    _deadband_class = "oxygen"
     _attr_icon = "mdi:gas-cylinder"
     _attr_device_class = SensorDeviceClass.POWER_FACTOR
-    _attr_native_unit_of_measurement = PERCENTAGE
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _value_key = "oxygen"
 
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None]):
-        super().__init__(coordinator)
-        serial = entry.data.get(CONF_SERIAL, "unknown")
-        dev_name = entry.data.get(CONF_NAME) or f"NBE {serial}"
-        self._attr_unique_id = f"{serial}_oxygen"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, serial)},
-            manufacturer=ATTR_MANUFACTURER,
-            name=dev_name,
-            model="StokerCloud",
-        )
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "oxygen")
 
     @property
     def available(self) -> bool:
-        return self.coordinator.data is not None
-
-    @property
-    def native_value(self) -> float | None:
-        return self.coordinator.data
+        return super().available and self.value is not None
 
     @property
     def extra_state_attributes(self):
-        return {"source_path": "boilerdata[id=12].value"}
+        return {**(super().extra_state_attributes or {}), "source_path": "boilerdata[id=12].value"}
 
 
-class HopperConsumption24hSensor(CoordinatorEntity, SensorEntity):
-    _attr_has_entity_name = True
+class HopperConsumption24hSensor(_StokerCloudSensor):
     _attr_name = "Pellet consumption (last 24h)"
-    _attr_native_unit_of_measurement = UnitOfMass.KILOGRAMS
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _value_key = "hopper_consumption_24h"
 
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None]):
-        super().__init__(coordinator)
-        serial = entry.data.get(CONF_SERIAL, "unknown")
-        dev_name = entry.data.get(CONF_NAME) or f"NBE {serial}"
-        self._attr_unique_id = f"{serial}_hopper_consumption_24h"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, serial)},
-            manufacturer=ATTR_MANUFACTURER,
-            name=dev_name,
-            model="StokerCloud",
-        )
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "hopper_consumption_24h")
 
     @property
     def available(self) -> bool:
-        return self.coordinator.data is not None
-
-    @property
-    def native_value(self) -> float | None:
-        return self.coordinator.data
+        return super().available and self.value is not None
 
     @property
     def extra_state_attributes(self):
         return {
+            **(super().extra_state_attributes or {}),
             "source_array": "hopperdata",
             "source_id": "3",
-            "source_selection": "hopper2",
+            "source_selection": self.coordinator.api.selection(self._value_key),
             "meaning": "Consumption last 24 h.",
             "api_endpoint": "controllerdata2.php",
         }
 
 
-# --- NEW: Hopper pellet remainder sensor class ---
-class HopperContentSensor(CoordinatorEntity[DataUpdateCoordinator[float | None]], SensorEntity):
-    _attr_has_entity_name = True
+class HopperContentSensor(_StokerCloudSensor):
     _attr_name = "Hopper content"
-    _attr_native_unit_of_measurement = UnitOfMass.KILOGRAMS
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_device_class = SensorDeviceClass.WEIGHT  # You can add the device class "Weight".
     _attr_icon = "mdi:silo"
+    _value_key = "hopper_content"
 
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None]):
-        super().__init__(coordinator)
-        serial = entry.data.get(CONF_SERIAL, "unknown")
-        dev_name = entry.data.get(CONF_NAME) or f"NBE {serial}"
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
         # We add _sensor to avoid an ID conflict with number.hopper_content.
-        self._attr_unique_id = f"{serial}_hopper_content_sensor"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, serial)},
-            manufacturer=ATTR_MANUFACTURER,
-            name=dev_name,
-            model="StokerCloud",
-        )
+        super().__init__(entry, coordinator, "hopper_content_sensor")
 
     @property
     def available(self) -> bool:
-        return self.coordinator.data is not None
+        return super().available and self.value is not None
 
-    @property
-    def native_value(self) -> float | None:
-        return self.coordinator.data
 
-class DhwDifferenceUnder(CoordinatorEntity[DataUpdateCoordinator[float | None]], SensorEntity):
-    _attr_has_entity_name = True
+class DhwDifferenceUnder(_StokerCloudSensor):
     _attr_name = "DHW difference under"
-    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_icon = "mdi:thermometer"
+    _value_key = "dhw_difference_under"
 
-    def __init__(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator[float | None]):
-        super().__init__(coordinator)
-        serial = entry.data.get(CONF_SERIAL, "unknown")
-        dev_name = entry.data.get(CONF_NAME) or f"NBE {serial}"
-        # We add _sensor to avoid an ID conflict with number.hopper_content.
-        self._attr_unique_id = f"{serial}_dhw_difference_under_sensor"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, serial)},
-            manufacturer=ATTR_MANUFACTURER,
-            name=dev_name,
-            model="StokerCloud",
-        )
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        # We add _sensor to avoid an ID conflict with number.dhw_difference_under.
+        super().__init__(entry, coordinator, "dhw_difference_under_sensor")
 
     @property
     def available(self) -> bool:
-        return self.coordinator.data is not None
+        return super().available and self.value is not None
+
+
+# ---------------------------
+# Diagnostic sensors (disabled by default): fetch telemetry, see api.read_stats
+# ---------------------------
+
+class _StokerCloudDiagnosticSensor(StokerCloudEntity, SensorEntity):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    @property
+    def available(self) -> bool:
+        # Telemetry stays readable while StokerCloud is failing; that is when it matters.
+        return True
+
+    def _is_affected(self, changed: set[str]) -> bool:
+        # Telemetry changes with every request, not with the payload.
+        return True
+
+    @property
+    def extra_state_attributes(self):
+        return None
+
+
+class FetchLatencySensor(_StokerCloudDiagnosticSensor):
+    _attr_name = "Fetch latency"
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "fetch_latency")
 
     @property
     def native_value(self) -> float | None:
-        return self.coordinator.data
+        return self.coordinator.api.read_stats.latency_ms(95)
+
+    @property
+    def extra_state_attributes(self):
+        stats = self.coordinator.api.read_stats
+        return {"p50": stats.latency_ms(50), "p95": stats.latency_ms(95), "max": stats.max_latency_ms}
+
+
+class FetchFailuresSensor(_StokerCloudDiagnosticSensor):
+    _attr_name = "Fetch failures"
+    _attr_icon = "mdi:cloud-alert"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "fetch_failures")
+
+    @property
+    def native_value(self) -> int:
+        return self.coordinator.api.read_stats.failure_count
+
+    @property
+    def extra_state_attributes(self):
+        stats = self.coordinator.api.read_stats
+        return {**stats.failures, "successes": stats.successes, "last_error": stats.last_error}
+
+
+class LastGoodPayloadSensor(_StokerCloudDiagnosticSensor):
+    _attr_name = "Last good payload"
+    _attr_icon = "mdi:cloud-check"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "last_good_payload")
+
+    @property
+    def native_value(self):
+        return self.coordinator.api.read_stats.last_success
+
+
+class CloudConnectionSensor(_StokerCloudDiagnosticSensor):
+    """Circuit breaker state: closed (normal), open (failing fast), half_open (probing)."""
+
+    _attr_name = "Cloud connection"
+    _attr_icon = "mdi:cloud-sync"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = BREAKER_STATES
+    _attr_entity_registry_enabled_default = True
+
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "cloud_connection")
+        self._shown = self._breaker_state()
+
+    def _breaker_state(self) -> tuple:
+        breaker = self.coordinator.api.breaker
+        return breaker.state, breaker.failures, breaker.trips
+
+    def _is_affected(self, changed: set[str]) -> bool:
+        # Enabled by default, so only write when the breaker itself changed.
+        shown, self._shown = self._shown, self._breaker_state()
+        return shown != self._shown
+
+    @property
+    def native_value(self) -> str:
+        return self.coordinator.api.breaker.state
+
+    @property
+    def extra_state_attributes(self):
+        breaker = self.coordinator.api.breaker
+        return {
+            "failures_in_a_row": breaker.failures,
+            "retry_at": breaker.open_until.isoformat() if breaker.open_until else None,
+            "trips": breaker.trips,
+            "short_circuited": self.coordinator.api.requests_short_circuited,
+        }
+
+
+class CommandQueueDepthSensor(_StokerCloudDiagnosticSensor):
+    """Writes waiting for stokercloud.dk to come back (see outbox.CommandOutbox)."""
+
+    _attr_name = "Queued commands"
+    _attr_icon = "mdi:tray-full"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_registry_enabled_default = True
+
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "command_queue_depth")
+        self._shown = self._queue_state()
+
+    def _queue_state(self) -> tuple:
+        outbox = self.coordinator.api.outbox
+        return tuple((name, cmd.value, cmd.attempts) for name, cmd in outbox.commands.items())
+
+    def _is_affected(self, changed: set[str]) -> bool:
+        # Enabled by default, so only write when the queue itself changed.
+        shown, self._shown = self._shown, self._queue_state()
+        return shown != self._shown
+
+    @property
+    def native_value(self) -> int:
+        return len(self.coordinator.api.outbox.commands)
+
+    @property
+    def extra_state_attributes(self):
+        outbox = self.coordinator.api.outbox
+        return {
+            **{name: cmd.as_dict() for name, cmd in outbox.commands.items()},
+            "delivered": outbox.delivered,
+            "expired": outbox.expired,
+        }
+
+
+class CommandQueueAgeSensor(_StokerCloudDiagnosticSensor):
+    _attr_name = "Oldest queued command age"
+    _attr_icon = "mdi:tray-alert"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "command_queue_age")
+
+    @property
+    def native_value(self) -> int | None:
+        if (oldest := self.coordinator.api.outbox.oldest) is None:
+            return None
+        return int((dt_util.utcnow() - oldest).total_seconds())
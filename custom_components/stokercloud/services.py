@@ -0,0 +1,181 @@
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, CONF_SERIAL, PROFILE_FILE, WRITE_VALUE_KEYS
+from .coordinator import StokerCloudCoordinator
+from .profiling import get_profiler
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_START_PROFILING = "start_profiling"
+SERVICE_STOP_PROFILING = "stop_profiling"
+SERVICE_SET_PARAMETERS = "set_parameters"
+ATTR_DURATION = "duration"
+ATTR_SERIAL = "serial"
+ATTR_WRITES = "writes"
+ATTR_NAME = "name"
+ATTR_VALUE = "value"
+ATTR_STAGE = "stage"
+
+START_PROFILING_SCHEMA = vol.Schema({vol.Optional(ATTR_DURATION): vol.All(vol.Coerce(float), vol.Range(min=1))})
+
+_SERIALS = vol.All(cv.ensure_list, [cv.string])
+SET_PARAMETERS_SCHEMA = vol.Schema({
+    # Boilers every write goes to, unless the write names its own.
+    vol.Optional(ATTR_SERIAL): _SERIALS,
+    vol.Required(ATTR_WRITES): vol.All(cv.ensure_list, [vol.Schema({
+        vol.Optional(ATTR_SERIAL): _SERIALS,
+        vol.Required(ATTR_NAME): cv.string,
+        vol.Required(ATTR_VALUE): vol.Any(bool, vol.Coerce(float), cv.string),
+        # Per boiler, stages run in ascending order; writes within a stage run concurrently.
+        vol.Optional(ATTR_STAGE, default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    })]),
+})
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Domain services, registered once for all entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_START_PROFILING):
+        return
+    profiler = get_profiler(hass)
+    auto_stop = None
+
+    async def _dump() -> None:
+        nonlocal auto_stop
+        if auto_stop is not None:
+            auto_stop()
+            auto_stop = None
+        if not profiler.enabled:
+            return
+        result = profiler.stop()
+        path = hass.config.path(PROFILE_FILE.format(datetime.now().strftime("%Y%m%d_%H%M%S")))
+        await hass.async_add_executor_job(_write_json, path, result)
+        _LOGGER.info("StokerCloud profile written to %s", path)
+
+    async def _start(call: ServiceCall) -> None:
+        nonlocal auto_stop
+        if auto_stop is not None:
+            auto_stop()
+            auto_stop = None
+        profiler.start()
+        if (duration := call.data.get(ATTR_DURATION)) is not None:
+            auto_stop = async_call_later(hass, duration, lambda _now: hass.async_create_task(_dump()))
+
+    async def _stop(call: ServiceCall) -> None:
+        await _dump()
+
+    async def _set_parameters(call: ServiceCall) -> ServiceResponse:
+        return await _async_set_parameters(hass, call)
+
+    hass.services.async_register(DOMAIN, SERVICE_START_PROFILING, _start, schema=START_PROFILING_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_STOP_PROFILING, _stop, schema=vol.Schema({}))
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_PARAMETERS, _set_parameters,
+        schema=SET_PARAMETERS_SCHEMA, supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def async_unregister_services(hass: HomeAssistant) -> None:
+    for service in (SERVICE_START_PROFILING, SERVICE_STOP_PROFILING, SERVICE_SET_PARAMETERS):
+        hass.services.async_remove(DOMAIN, service)
+
+
+async def _async_set_parameters(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """
+    Batch of updatevalue.php writes across boilers. Boilers are written concurrently; per boiler
+    the stages run in order, and a stage's writes share the boiler's write queue (see WriteQueue).
+    """
+    coordinators = {
+        c.entry.data.get(CONF_SERIAL): c
+        for c in hass.data.get(DOMAIN, {}).values()
+        if isinstance(c, StokerCloudCoordinator)
+    }
+    results: list[dict[str, Any]] = []
+    # serial → stage → indexes into results
+    plan: dict[str, dict[int, list[int]]] = {}
+    seen: set[tuple[str, int, str]] = set()
+    for write in call.data[ATTR_WRITES]:
+        serials = write.get(ATTR_SERIAL) or call.data.get(ATTR_SERIAL)
+        if not serials:
+            raise ServiceValidationError(f"No boiler serial for the write of {write[ATTR_NAME]}")
+        for serial in serials:
+            # The write queue would collapse them to the last value, and only that one is sent.
+            if (key := (serial, write[ATTR_STAGE], write[ATTR_NAME])) in seen:
+                raise ServiceValidationError(
+                    f"{write[ATTR_NAME]} is written twice to boiler {serial} in stage {write[ATTR_STAGE]}"
+                )
+            seen.add(key)
+            result = {
+                ATTR_SERIAL: serial, ATTR_NAME: write[ATTR_NAME], ATTR_VALUE: write[ATTR_VALUE],
+                ATTR_STAGE: write[ATTR_STAGE], "status": None, "latency_ms": None,
+            }
+            if serial not in coordinators:
+                result["status"] = "unknown_boiler"
+            else:
+                plan.setdefault(serial, {}).setdefault(write[ATTR_STAGE], []).append(len(results))
+            results.append(result)
+
+    await asyncio.gather(*(
+        _async_write_boiler(coordinators[serial], stages, results) for serial, stages in plan.items()
+    ))
+    return {
+        "results": results,
+        "succeeded": sum(r["status"] == "ok" for r in results),
+        "failed": sum(r["status"] != "ok" for r in results),
+    }
+
+
+async def _async_write_boiler(
+    coordinator: StokerCloudCoordinator, stages: dict[int, list[int]], results: list[dict[str, Any]]
+) -> None:
+    for stage in sorted(stages):
+        await asyncio.gather(*(_async_write_one(coordinator, results[i]) for i in stages[stage]))
+        if any(results[i]["status"] != "ok" for i in stages[stage]):
+            # Later stages depend on this one.
+            for later in (s for s in sorted(stages) if s > stage):
+                for i in stages[later]:
+                    results[i]["status"] = "skipped"
+            break
+
+
+async def _async_write_one(coordinator: StokerCloudCoordinator, result: dict[str, Any]) -> None:
+    name = result[ATTR_NAME]
+    try:
+        value = _coerce(name, result[ATTR_VALUE])
+    except (vol.Invalid, ValueError):
+        result["status"] = "invalid"
+        return
+    started = time.monotonic()
+    # Already batched: no debounce window, but still collapsed with a pending write of the same name.
+    ok = await coordinator.api.async_submit_write(name, value, debounce=0.0)
+    result["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+    result["status"] = "ok" if ok else "failed"
+    if ok:
+        coordinator.async_handle_write(name, value)
+
+
+def _coerce(name: str, value: Any) -> Any:
+    """Value as the write path expects it for the known parameters; others are sent as given."""
+    if name == "misc.power":
+        return cv.boolean(value)
+    if name in WRITE_VALUE_KEYS:
+        return float(value)
+    return value
+
+
+def _write_json(path: str, data: dict) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2)
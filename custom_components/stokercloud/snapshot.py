@@ -0,0 +1,113 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Any
+
+
+def to_number(raw) -> float | None:
+    """Convert '8,9' / 8.9 / '' to float or None."""
+    if raw in (None, ""):
+        return None
+    try:
+        return float(str(raw).replace(",", "."))
+    except Exception:
+        return None
+
+
+class SnapshotItem:
+    """One {"id": ..., "value": ...} element with its value converted once."""
+
+    __slots__ = ("id", "raw", "number", "selection")
+
+    def __init__(self, item_id: str, raw, selection: str | None):
+        self.id = item_id
+        self.raw = raw
+        self.number = to_number(raw)
+        self.selection = selection
+
+
+class ControllerSnapshot:
+    """
+    Parsed controllerdata2.php payload, indexed in one pass per response.
+    Items are reachable by (section, id) and by selection, so every lookup is a dict hit.
+    """
+
+    __slots__ = ("raw", "items", "selections", "values", "fetched_at", "stale")
+
+    def __init__(self, raw: dict):
+        # Shallow copy: the decoded payload may be shared by coalesced callers.
+        self.raw = dict(raw)
+        self.items: dict[tuple[str, str], SnapshotItem] = {}
+        self.selections: dict[str, SnapshotItem] = {}
+        # Platform values (see fields.FIELDS); entities read them via get().
+        self.values: dict[str, Any] = {}
+        # When the payload was downloaded, and whether it is served because the latest request failed.
+        self.fetched_at: datetime | None = None
+        self.stale = False
+        self._index(raw)
+
+    def merge(self, raw: dict) -> None:
+        """Index another payload (e.g. a separate screen) into this snapshot."""
+        for key, val in raw.items():
+            if isinstance(val, list) and isinstance(self.raw.get(key), list):
+                self.raw[key] = self.raw[key] + val
+            else:
+                self.raw.setdefault(key, val)
+        self._index(raw)
+
+    def _index(self, raw: dict) -> None:
+        # Walk the whole tree once; the section is the top-level key an item lives under.
+        # Items are visited in document order, so the first match wins like a linear scan would.
+        stack: list[tuple[str, Any]] = [(key, val) for key, val in reversed(raw.items())]
+        while stack:
+            section, obj = stack.pop()
+            if isinstance(obj, list):
+                stack.extend((section, x) for x in reversed(obj))
+            elif isinstance(obj, dict):
+                if "id" in obj:
+                    sel = obj.get("selection")
+                    item = SnapshotItem(
+                        str(obj.get("id")),
+                        obj["value"] if "value" in obj else obj.get("val"),
+                        None if sel is None else str(sel),
+                    )
+                    self.items.setdefault((section, item.id), item)
+                    if item.selection is not None:
+                        self.selections.setdefault(item.selection, item)
+                stack.extend((section, v) for v in reversed(obj.values()) if isinstance(v, (list, dict)))
+
+    def item(self, section: str, item_id: str) -> SnapshotItem | None:
+        return self.items.get((section, item_id))
+
+    def number(self, section: str, item_id: str) -> float | None:
+        item = self.items.get((section, item_id))
+        return item.number if item else None
+
+    def path(self, *keys: str):
+        """Value at a dict path, e.g. path("miscdata", "state", "value")."""
+        obj: Any = self.raw
+        for key in keys:
+            if not isinstance(obj, dict):
+                return None
+            obj = obj.get(key)
+        return obj
+
+    def get(self, key: str, default=None):
+        return self.values.get(key, default)
+
+    def changed_keys(self, previous: ControllerSnapshot) -> set[str]:
+        """Platform values that differ from an earlier snapshot."""
+        old = previous.values
+        changed = {key for key, val in self.values.items() if key not in old or old[key] != val}
+        changed.update(old.keys() - self.values.keys())
+        return changed
+
+    def with_value(self, key: str, value: Any) -> ControllerSnapshot:
+        """Copy sharing the indexes, with one platform value replaced."""
+        new = object.__new__(ControllerSnapshot)
+        new.raw = self.raw
+        new.items = self.items
+        new.selections = self.selections
+        new.values = {**self.values, key: value}
+        new.fetched_at = self.fetched_at
+        new.stale = self.stale
+        return new
@@ -0,0 +1,67 @@
+from __future__ import annotations
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import SNAPSHOT_STORAGE_KEY, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_SAVE_DELAY, SNAPSHOT_MAX_AGE
+from .fields import FIELDS_BY_KEY
+from .snapshot import ControllerSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """
+    Last good snapshot values of one entry in Home Assistant's storage. Only the parsed
+    platform values and their fetch time are kept; the raw payload is not needed to show them.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_STORAGE_KEY.format(entry_id)
+        )
+        self._latest: ControllerSnapshot | None = None
+        self._pending = False
+
+    async def async_load(self) -> ControllerSnapshot | None:
+        """The stored snapshot, marked stale; None if there is none or it is too old."""
+        try:
+            stored = await self._store.async_load()
+            fetched_at = datetime.fromisoformat(stored["fetched_at"]) if stored else None
+            values = stored["values"] if stored else None
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.debug("Ignoring unreadable stored snapshot: %s", err)
+            return None
+        if fetched_at is None or datetime.now(timezone.utc) - fetched_at > timedelta(seconds=SNAPSHOT_MAX_AGE):
+            return None
+        snap = ControllerSnapshot({})
+        # Fields added or removed since the snapshot was written are simply missing / ignored.
+        snap.values = {key: val for key, val in values.items() if key in FIELDS_BY_KEY}
+        snap.fetched_at = fetched_at
+        snap.stale = True
+        return snap
+
+    @callback
+    def async_save(self, snap: ControllerSnapshot) -> None:
+        """Schedule a write of a freshly fetched snapshot; later calls replace earlier ones."""
+        if snap.stale or snap.fetched_at is None:
+            return
+        self._latest = snap
+        self._pending = True
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Write a scheduled save now (entry unload); Home Assistant flushes the rest on shutdown."""
+        if self._pending:
+            await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        self._pending = False
+        snap = self._latest
+        return {"fetched_at": snap.fetched_at.isoformat(), "values": snap.values}
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
@@ -1,15 +1,17 @@
 from __future__ import annotations
 import logging
+import time
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.helpers.restore_state import RestoreEntity
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, ATTR_MANUFACTURER, CONF_SERIAL, CONF_NAME
+from .const import DOMAIN, CONFIRM_TIMEOUT
 from .api import StokerCloudWriteApi
+from .coordinator import StokerCloudCoordinator
+from .entity import StokerCloudEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,31 +19,26 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
-    api: StokerCloudWriteApi = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([BoilerPowerSwitch(entry, api)], True)
+    coordinator: StokerCloudCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([BoilerPowerSwitch(entry, coordinator)])
 
 
-class BoilerPowerSwitch(RestoreEntity, SwitchEntity):
-    """Boiler control via misc.start / misc.stop."""
+class BoilerPowerSwitch(StokerCloudEntity, RestoreEntity, SwitchEntity):
+    """Boiler control via misc.start / misc.stop; the state follows miscdata.running."""
 
-    _attr_has_entity_name = True
     _attr_name = "Boiler power"
     _attr_icon = "mdi:power"
     # Ensure that by default the entity is NOT disabled.
     _attr_entity_registry_enabled_default = True
+    _value_key = "boiler_running"
 
-    def __init__(self, entry: ConfigEntry, api: StokerCloudWriteApi):
-        self._entry = entry
-        self._api = api
-        self._serial = entry.data.get(CONF_SERIAL, "unknown")
-        self._attr_unique_id = f"{self._serial}_boiler_power"
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, self._serial)},
-            manufacturer=ATTR_MANUFACTURER,
-            name=entry.data.get(CONF_NAME) or f"NBE {self._serial}",
-            model="StokerCloud",
-        )
-        self._attr_is_on = None  # Will become True/False after restore or the first action.
+    def __init__(self, entry: ConfigEntry, coordinator: StokerCloudCoordinator):
+        super().__init__(entry, coordinator, "boiler_power")
+        self._api: StokerCloudWriteApi = coordinator.api
+        self._attr_is_on = None  # Last state before the restart; used only while the controller reports none.
+        # Last command, shown until the controller reports it or CONFIRM_TIMEOUT passes.
+        self._command: bool | None = None
+        self._command_until = 0.0
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
@@ -49,23 +46,51 @@ class BoilerPowerSwitch(RestoreEntity, SwitchEntity):
             self._attr_is_on = (last.state == "on")
         self.async_write_ha_state()
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._command is not None and (self.value == self._command or time.monotonic() >= self._command_until):
+            # Back to the reported state, even if this refresh did not change it.
+            self._command = None
+            self.async_write_ha_state()
+            return
+        super()._handle_coordinator_update()
+
+    def _is_affected(self, changed: set[str]) -> bool:
+        return self._command is not None or super()._is_affected(changed)
+
     @property
     def available(self) -> bool:
         # Optimistic mode - control works without reading the state from the cloud.
         return True
 
+    @property
+    def is_on(self) -> bool | None:
+        if self._command is not None:
+            return self._command
+        value = self.value
+        return self._attr_is_on if value is None else value
+
     async def async_turn_on(self, **kwargs) -> None:
-        ok = await self._api.async_set_power(True)   # misc.start=1
+        ok = await self._api.async_submit_write("misc.power", True)   # misc.start=1
         if ok:
-            self._attr_is_on = True
-            self.async_write_ha_state()
+            self._set_command(True)
+        elif self._api.write_queued("misc.power"):
+            _LOGGER.warning("Could not turn ON boiler now (misc.start=1), queued for retry")
         else:
             _LOGGER.warning("Failed to turn ON boiler (misc.start=1)")
 
     async def async_turn_off(self, **kwargs) -> None:
-        ok = await self._api.async_set_power(False)  # misc.stop=1
+        ok = await self._api.async_submit_write("misc.power", False)  # misc.stop=1
         if ok:
-            self._attr_is_on = False
-            self.async_write_ha_state()
+            self._set_command(False)
+        elif self._api.write_queued("misc.power"):
+            _LOGGER.warning("Could not turn OFF boiler now (misc.stop=1), queued for retry")
         else:
             _LOGGER.warning("Failed to turn OFF boiler (misc.stop=1)")
+
+    def _set_command(self, turn_on: bool) -> None:
+        self._command = self._attr_is_on = turn_on
+        self._command_until = time.monotonic() + CONFIRM_TIMEOUT
+        self.async_write_ha_state()
+        # Follow the ignition / shutdown closely.
+        self.coordinator.async_boost_polling()
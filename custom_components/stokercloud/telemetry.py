@@ -0,0 +1,95 @@
+from __future__ import annotations
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Any
+
+from .const import TELEMETRY_WINDOW
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+class RequestTelemetry:
+    """
+    Rolling statistics for one kind of request to stokercloud.dk (reads or writes).
+    Latency and size are kept for the last TELEMETRY_WINDOW requests; counts are since setup.
+    """
+
+    def __init__(self, window: int = TELEMETRY_WINDOW):
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._sizes: deque[int] = deque(maxlen=window)
+        # Bytes as sent (before decompression), where known.
+        self._wire_sizes: deque[int] = deque(maxlen=window)
+        self.bytes_total = 0
+        self.wire_bytes_total = 0
+        self.successes = 0
+        # Cause → count: timeout, connection, http_<status>, json, encoding, empty.
+        self.failures: Counter[str] = Counter()
+        self.last_success: datetime | None = None
+        self.last_failure: datetime | None = None
+        self.last_error: str | None = None
+
+    def record_success(self, latency: float, size: int | None = None, wire_size: int | None = None) -> None:
+        self._latencies.append(latency)
+        if size is not None:
+            self._sizes.append(size)
+            self.bytes_total += size
+        if wire_size is not None:
+            self._wire_sizes.append(wire_size)
+            self.wire_bytes_total += wire_size
+        self.successes += 1
+        self.last_success = datetime.now(timezone.utc)
+
+    def record_failure(self, cause: str, latency: float, error: str | None = None) -> None:
+        self._latencies.append(latency)
+        self.failures[cause] += 1
+        self.last_failure = datetime.now(timezone.utc)
+        self.last_error = error or cause
+
+    def latency_ms(self, pct: float) -> float | None:
+        value = _percentile(list(self._latencies), pct)
+        return None if value is None else round(value * 1000, 1)
+
+    @property
+    def max_latency_ms(self) -> float | None:
+        return round(max(self._latencies) * 1000, 1) if self._latencies else None
+
+    @property
+    def mean_bytes(self) -> float | None:
+        return round(sum(self._sizes) / len(self._sizes), 1) if self._sizes else None
+
+    @property
+    def mean_wire_bytes(self) -> float | None:
+        return round(sum(self._wire_sizes) / len(self._wire_sizes), 1) if self._wire_sizes else None
+
+    @property
+    def failure_count(self) -> int:
+        return sum(self.failures.values())
+
+    def seconds_since_success(self) -> float | None:
+        if self.last_success is None:
+            return None
+        return round((datetime.now(timezone.utc) - self.last_success).total_seconds(), 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "successes": self.successes,
+            "failures": dict(self.failures),
+            "latency_ms": {
+                "p50": self.latency_ms(50),
+                "p95": self.latency_ms(95),
+                "max": self.max_latency_ms,
+            },
+            "mean_bytes": self.mean_bytes,
+            "mean_wire_bytes": self.mean_wire_bytes,
+            "bytes_total": self.bytes_total,
+            "wire_bytes_total": self.wire_bytes_total,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "seconds_since_success": self.seconds_since_success(),
+            "last_failure": self.last_failure.isoformat() if self.last_failure else None,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WriteQueue:
+    """
+    Per-boiler queue for updatevalue.php writes.
+    Submissions for the same parameter inside the debounce window collapse to the latest
+    value, and writes of one parameter are sent one at a time, so the last value wins.
+    Different parameters are sent concurrently, up to max_concurrent at once.
+    """
+
+    def __init__(self, send: Callable[[str, Any], Awaitable[bool]], debounce: float, max_concurrent: int = 1):
+        self._send = send
+        self._debounce = debounce
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._slots = asyncio.Semaphore(max_concurrent)
+        # name → [latest value, futures of every submission it replaced]
+        self._pending: dict[str, list[Any]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        # Flushes started by the timers, referenced until they finish.
+        self._flushes: set[asyncio.Task] = set()
+        self.submitted = 0
+        self.sent = 0
+
+    async def async_submit(self, name: str, value: Any, debounce: float | None = None) -> bool:
+        """
+        Queue a write; resolves with the result of the write that carried it (or a newer value).
+        debounce overrides the queue's window, e.g. 0 for writes that are already batched.
+        """
+        loop = asyncio.get_running_loop()
+        self.submitted += 1
+        fut: asyncio.Future[bool] = loop.create_future()
+        if (pending := self._pending.get(name)) is not None:
+            pending[0] = value
+            pending[1].append(fut)
+        else:
+            self._pending[name] = [value, [fut]]
+        if (timer := self._timers.pop(name, None)) is not None:
+            timer.cancel()
+        self._timers[name] = loop.call_later(
+            self._debounce if debounce is None else debounce, self._start_flush, name
+        )
+        return await fut
+
+    def _start_flush(self, name: str) -> None:
+        task = asyncio.get_running_loop().create_task(self._async_flush(name))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _async_flush(self, name: str) -> None:
+        self._timers.pop(name, None)
+        async with self._locks.setdefault(name, asyncio.Lock()), self._slots:
+            # Taken under the lock: values submitted while an earlier write was in flight
+            # are merged into this one.
+            if (pending := self._pending.pop(name, None)) is None:
+                return
+            value, waiters = pending
+            try:
+                ok = await self._send(name, value)
+            except Exception:
+                _LOGGER.exception("Write of %s=%s failed", name, value)
+                ok = False
+            self.sent += 1
+        for fut in waiters:
+            if not fut.done():
+                fut.set_result(ok)
+
+    async def async_flush_all(self) -> None:
+        """Send everything still waiting for its debounce window and wait for writes in flight (e.g. on unload)."""
+        for name in list(self._timers):
+            self._timers.pop(name).cancel()
+        for name in list(self._pending):
+            await self._async_flush(name)
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
@@ -0,0 +1,116 @@
+"""CircuitBreaker state machine: closed → open → half-open → probe outcome."""
+from __future__ import annotations
+import asyncio
+
+import pytest
+
+from custom_components.stokercloud import breaker as breaker_module
+from custom_components.stokercloud.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(breaker_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _trip(breaker: CircuitBreaker) -> None:
+    for _ in range(3):
+        with breaker.attempt() as allowed:
+            assert allowed
+            breaker.record_failure()
+
+
+def test_opens_after_threshold_and_fails_fast(clock):
+    breaker = CircuitBreaker(threshold=3, base_backoff=30, max_backoff=900)
+    _trip(breaker)
+    assert breaker.state == OPEN
+    assert breaker.trips == 1
+    with breaker.attempt() as allowed:
+        assert not allowed
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(threshold=3, base_backoff=30, max_backoff=900)
+    _trip(breaker)
+    clock[0] += 30
+    with breaker.attempt() as probe:
+        assert probe
+        assert breaker.state == HALF_OPEN
+        with breaker.attempt() as second:
+            assert not second
+        breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+
+
+def test_failed_probe_reopens_with_longer_backoff(clock):
+    breaker = CircuitBreaker(threshold=3, base_backoff=30, max_backoff=900)
+    _trip(breaker)
+    clock[0] += 30
+    with breaker.attempt() as probe:
+        assert probe
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.trips == 2
+    # Second backoff is 60 s with equal jitter: at least 30 s.
+    clock[0] += 29
+    with breaker.attempt() as allowed:
+        assert not allowed
+
+
+@pytest.mark.parametrize("error", [RuntimeError("boom"), KeyboardInterrupt()])
+def test_probe_ending_without_outcome_is_released(clock, error):
+    breaker = CircuitBreaker(threshold=3, base_backoff=30, max_backoff=900)
+    _trip(breaker)
+    clock[0] += 30
+    with pytest.raises(type(error)):
+        with breaker.attempt() as probe:
+            assert probe
+            raise error
+    assert breaker.state == HALF_OPEN
+    # The next request probes again instead of being short-circuited forever.
+    with breaker.attempt() as probe:
+        assert probe
+        breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_cancelled_probe_then_recovery(clock):
+    breaker = CircuitBreaker(threshold=3, base_backoff=30, max_backoff=900)
+    _trip(breaker)
+    clock[0] += 30
+
+    async def probe() -> None:
+        with breaker.attempt() as allowed:
+            assert allowed
+            await asyncio.sleep(10)
+
+    async def run() -> None:
+        task = asyncio.ensure_future(probe())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    with breaker.attempt() as allowed:
+        assert allowed
+        breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_request_started_while_closed_does_not_release_probe(clock):
+    breaker = CircuitBreaker(threshold=3, base_backoff=30, max_backoff=900)
+    slow = breaker.attempt()
+    assert slow.__enter__()
+    _trip(breaker)
+    clock[0] += 30
+    with breaker.attempt() as probe:
+        assert probe
+        # The slow request from before the outage ends while the probe is out.
+        slow.__exit__(None, None, None)
+        with breaker.attempt() as second:
+            assert not second
+        breaker.record_success()
@@ -0,0 +1,61 @@
+"""CommandOutbox retries: a failed send always backs off, a rejected write leaves the queue."""
+from __future__ import annotations
+import asyncio
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.stokercloud.const import COMMAND_RETRY_BASE
+from custom_components.stokercloud.outbox import CommandOutbox
+
+
+def _run(tmp_path, test) -> None:
+    async def main():
+        hass = HomeAssistant(str(tmp_path))
+        try:
+            await test(hass)
+        finally:
+            await hass.async_stop(force=True)
+
+    asyncio.run(main())
+
+
+def test_failed_send_without_outcome_backs_off(tmp_path):
+    async def test(hass):
+        sends = []
+
+        async def send(name, value):
+            # Like a rejected or raising write: no add() / discard() from the write path.
+            sends.append(value)
+            return False
+
+        outbox = CommandOutbox(hass, "entry", "boiler", send)
+        outbox.add("boiler.temp", 70)
+        outbox.commands["boiler.temp"].retry_at = dt_util.utcnow()
+        await outbox._async_retry()
+        await asyncio.sleep(0.1)
+        assert sends == [70]
+        cmd = outbox.commands["boiler.temp"]
+        assert cmd.attempts == 2
+        assert (cmd.retry_at - dt_util.utcnow()).total_seconds() > COMMAND_RETRY_BASE
+        await outbox.async_shutdown()
+
+    _run(tmp_path, test)
+
+
+def test_send_that_settles_the_command_is_not_requeued(tmp_path):
+    async def test(hass):
+        outbox: CommandOutbox
+
+        async def send(name, value):
+            outbox.discard(name)  # the write path's answer to a rejected value
+            return False
+
+        outbox = CommandOutbox(hass, "entry", "boiler", send)
+        outbox.add("boiler.temp", 70)
+        outbox.commands["boiler.temp"].retry_at = dt_util.utcnow()
+        await outbox._async_retry()
+        assert not outbox.commands
+        await outbox.async_shutdown()
+
+    _run(tmp_path, test)
@@ -0,0 +1,263 @@
+"""
+Benchmark the integration against the offline stand-in (tools/fake_stokercloud).
+
+Sets up 1, 10 and 100 config entries in a bare Home Assistant instance and reports, per
+entry count: async_setup_entry wall time, time to first data, HTTP requests and bytes per
+poll cycle, and event-loop blocking. Payload decode and extraction are timed separately.
+Results are written as JSON so runs before and after a change can be compared:
+
+    python -m tools.benchmark --output bench_before.json
+    python -m tools.benchmark --output bench_after.json --compare bench_before.json
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO))
+
+from homeassistant import config_entries, loader  # noqa: E402
+from homeassistant.core import CoreState, HomeAssistant  # noqa: E402
+from homeassistant.helpers import (  # noqa: E402
+    area_registry as ar,
+    device_registry as dr,
+    entity,
+    entity_registry as er,
+    issue_registry as ir,
+    restore_state as rs,
+)
+
+# Imported from the repo before Home Assistant mounts its config dir, so the loader
+# and patch_integration_urls() see the same custom_components package.
+from custom_components.stokercloud import fields as sc_fields  # noqa: E402
+from custom_components.stokercloud.decoder import DECODERS  # noqa: E402
+from custom_components.stokercloud.const import (  # noqa: E402
+    CONF_DEDICATED_SESSION, CONF_NAME, CONF_SERIAL, CONF_TOKEN, DOMAIN,
+)
+from custom_components.stokercloud.snapshot import ControllerSnapshot  # noqa: E402
+from tools.fake_stokercloud import FakeStokerCloud, patch_integration_urls  # noqa: E402
+
+ENTRY_COUNTS = (1, 10, 100)
+
+
+class LoopMonitor:
+    """Measures how late a short periodic sleep wakes up: time the loop was blocked."""
+
+    def __init__(self, interval: float = 0.005, threshold: float = 0.010):
+        self.interval = interval
+        self.threshold = threshold
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - start - self.interval))
+
+    def start(self) -> None:
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> dict[str, float]:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        blocked = [lag for lag in self.lags if lag >= self.threshold]
+        return {
+            "max_ms": round(max(self.lags, default=0.0) * 1000, 3),
+            "blocked_total_ms": round(sum(blocked) * 1000, 3),
+            "blocked_count": len(blocked),
+        }
+
+
+async def _start_hass(config_dir: str) -> HomeAssistant:
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    entity.async_setup(hass)
+    loader.async_setup(hass)
+    await asyncio.gather(
+        ar.async_load(hass), dr.async_load(hass), er.async_load(hass), ir.async_load(hass), rs.async_load(hass)
+    )
+    hass.state = CoreState.running
+    return hass
+
+
+def _ms(seconds: list[float]) -> dict[str, float]:
+    return {
+        "mean_ms": round(statistics.fmean(seconds) * 1000, 3),
+        "p95_ms": round(sorted(seconds)[int(0.95 * (len(seconds) - 1))] * 1000, 3),
+        "max_ms": round(max(seconds) * 1000, 3),
+    }
+
+
+async def bench_entries(
+    count: int, cycles: int, latency: float, dedicated_session: bool = False, compress: bool = False
+) -> dict[str, Any]:
+    """Set up `count` entries, wait for their first data, then force `cycles` poll rounds."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _start_hass(config_dir)
+        async with FakeStokerCloud(latency=latency, compress=compress) as fake:
+            with patch_integration_urls(fake):
+                monitor = LoopMonitor()
+                monitor.start()
+                started = time.perf_counter()
+                for n in range(count):
+                    entry = config_entries.ConfigEntry(
+                        version=1,
+                        minor_version=1,
+                        domain=DOMAIN,
+                        title=f"Boiler {n}",
+                        data={CONF_NAME: f"Boiler {n}", CONF_SERIAL: str(10000 + n), CONF_TOKEN: f"token{n}"},
+                        source=config_entries.SOURCE_USER,
+                        options={CONF_DEDICATED_SESSION: dedicated_session},
+                    )
+                    await hass.config_entries.async_add(entry)
+                setup_all = time.perf_counter() - started
+                coordinators = [c for key, c in hass.data[DOMAIN].items() if hasattr(c, "setup_seconds")]
+                while any(c.first_data_seconds is None for c in coordinators):
+                    await asyncio.sleep(0.01)
+                first_data_all = time.perf_counter() - started
+                startup_loop = await monitor.stop()
+
+                fake.reset_logs()
+                wire_before = sum(c.api.read_stats.wire_bytes_total for c in coordinators)
+                monitor = LoopMonitor()
+                monitor.start()
+                cycle_times = []
+                for _ in range(cycles):
+                    # Past the response cache TTL of the main screen, as a scheduled poll would be;
+                    # slower tiers stay within their interval.
+                    for coordinator in coordinators:
+                        for key in [k for k in coordinator.api._cache if k[0] == coordinator.api.screen]:
+                            del coordinator.api._cache[key]
+                    t0 = time.perf_counter()
+                    await asyncio.gather(*(c.async_refresh() for c in coordinators))
+                    cycle_times.append(time.perf_counter() - t0)
+                cycle_loop = await monitor.stop()
+                wire_bytes = sum(c.api.read_stats.wire_bytes_total for c in coordinators) - wire_before
+
+                result = {
+                    "entries": count,
+                    "setup_entry": _ms([c.setup_seconds for c in coordinators]),
+                    "setup_all_ms": round(setup_all * 1000, 3),
+                    "first_data": _ms([c.first_data_seconds for c in coordinators]),
+                    "first_data_all_ms": round(first_data_all * 1000, 3),
+                    "requests_per_cycle": len(fake.requests) / cycles,
+                    "requests_per_entry_cycle": len(fake.requests) / cycles / count,
+                    "bytes_per_entry_cycle": fake.bytes_sent / cycles / count,
+                    # As received: smaller than bytes_per_entry_cycle when responses are compressed.
+                    "wire_bytes_per_entry_cycle": wire_bytes / cycles / count,
+                    "cycle": _ms(cycle_times),
+                    "loop_startup": startup_loop,
+                    "loop_cycles": cycle_loop,
+                    "failed_updates": sum(not c.last_update_success for c in coordinators),
+                }
+            for entry in hass.config_entries.async_entries(DOMAIN):
+                await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_stop(force=True)
+    return result
+
+
+def bench_parse(iterations: int) -> dict[str, Any]:
+    """Decode and extraction cost for one payload of the entry's screen, without I/O."""
+    fake = FakeStokerCloud()
+    screen, selections = sc_fields.build_screen_query(sc_fields.fields_for_entities(None))
+    body = json.dumps(fake.render("token", screen)).encode()
+
+    def timed(func) -> float:
+        t0 = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - t0) / iterations
+
+    raw = json.loads(body)
+    snap = ControllerSnapshot(raw)
+    getters = {
+        field.key: round(
+            timed(lambda field=field: field.extract(snap, selections.get(field.key))) * 1e6, 4
+        )
+        for field in sc_fields.FIELDS
+    }
+    return {
+        "screen": screen,
+        "payload_bytes": len(body),
+        "json_decode_us": round(timed(lambda: json.loads(body)) * 1e6, 3),
+        # Every decoder the integration can pick; the first one is used.
+        "decoder_us": {name: round(timed(lambda loads=loads: loads(body)) * 1e6, 3) for name, loads in DECODERS.items()},
+        "index_us": round(timed(lambda: ControllerSnapshot(raw)) * 1e6, 3),
+        "extract_us": round(timed(lambda: sc_fields.build_snapshot(snap, selections)) * 1e6, 3),
+        "getter_us": getters,
+    }
+
+
+def compare(current: dict, baseline: dict) -> list[str]:
+    """Lines like 'entries=10 setup_all_ms: 120.0 -> 80.0 (-33.3%)' for the headline numbers."""
+    lines = []
+    keys = ("setup_all_ms", "first_data_all_ms", "requests_per_entry_cycle", "bytes_per_entry_cycle")
+    before = {r["entries"]: r for r in baseline.get("entries", [])}
+    for run in current["entries"]:
+        old = before.get(run["entries"])
+        if old is None:
+            continue
+        for key in keys:
+            a, b = old[key], run[key]
+            change = f" ({(b - a) / a * 100:+.1f}%)" if a else ""
+            lines.append(f"entries={run['entries']} {key}: {a} -> {b}{change}")
+    for key in ("json_decode_us", "index_us", "extract_us"):
+        a, b = baseline["parse"][key], current["parse"][key]
+        lines.append(f"parse {key}: {a} -> {b} ({(b - a) / a * 100:+.1f}%)")
+    return lines
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "latency_s": args.latency,
+        "cycles": args.cycles,
+        "dedicated_session": args.dedicated_session,
+        "compress": args.compress,
+        "parse": bench_parse(args.iterations),
+        "entries": [
+            await bench_entries(n, args.cycles, args.latency, args.dedicated_session, args.compress)
+            for n in args.entries
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=list(ENTRY_COUNTS))
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake server latency, seconds")
+    parser.add_argument("--iterations", type=int, default=2000, help="parse benchmark iterations")
+    parser.add_argument("--dedicated-session", action="store_true", help="enable the dedicated HTTP client option")
+    parser.add_argument("--compress", action="store_true", help="fake server compresses reads")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--compare", help="earlier --output file to compare against")
+    args = parser.parse_args()
+
+    # The "custom integration not tested" warning is printed once per run otherwise.
+    logging.getLogger("homeassistant.loader").setLevel(logging.ERROR)
+    results = asyncio.run(run(args))
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(json.dumps(results, indent=2))
+    if args.compare:
+        print("\n".join(compare(results, json.loads(Path(args.compare).read_text()))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""Offline stand-in for the stokercloud.dk endpoints used by custom_components.stokercloud."""
+from .server import (
+    FAULTS,
+    FakeStokerCloud,
+    RequestRecord,
+    WriteRecord,
+    load_recording,
+    patch_integration_urls,
+    recording_names,
+)
+
+__all__ = [
+    "FAULTS",
+    "FakeStokerCloud",
+    "RequestRecord",
+    "WriteRecord",
+    "load_recording",
+    "patch_integration_urls",
+    "recording_names",
+]
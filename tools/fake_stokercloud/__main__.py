@@ -0,0 +1,46 @@
+"""
+Run the stand-in on its own, e.g.:
+
+    python -m tools.fake_stokercloud --port 8765 --state ignition --latency 0.3 --missing weatherdata
+"""
+from __future__ import annotations
+import argparse
+import logging
+
+from aiohttp import web
+
+from .server import FAULTS, FakeStokerCloud, recording_names
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline stokercloud.dk stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--state", default="running", choices=recording_names())
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency, up to this many seconds")
+    parser.add_argument("--decimal-point", action="store_true", help='emit "63.4" instead of "63,4"')
+    parser.add_argument("--missing", action="append", default=[], help='e.g. weatherdata or frontdata/boilertemp')
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-fault", default="http_500", choices=FAULTS)
+    parser.add_argument("--apply-delay", type=float, default=0.0, help="seconds before a write shows up in reads")
+    parser.add_argument("--compress", action="store_true", help="gzip/deflate reads the client accepts")
+    args = parser.parse_args()
+
+    fake = FakeStokerCloud(
+        args.state,
+        latency=args.latency,
+        jitter=args.jitter,
+        decimal_comma=not args.decimal_point,
+        missing=args.missing,
+        error_rate=args.error_rate,
+        error_fault=args.error_fault,
+        apply_delay=args.apply_delay,
+        compress=args.compress,
+    )
+    logging.basicConfig(level=logging.INFO)
+    web.run_app(fake.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+from __future__ import annotations
+import asyncio
+import copy
+import json
+import random
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+RECORDINGS = Path(__file__).parent / "recordings"
+CONTROLLERDATA_PATH = "/v2/dataout2/controllerdata2.php"
+UPDATE_PATH = "/v2/dataout2/updatevalue.php"
+
+# Screen query letter → section it fills and the selection prefix the controller uses.
+_SCREEN_SECTIONS = {
+    "b": ("boilerdata", "boiler"),
+    "d": ("dhwdata", "dhw"),
+    "h": ("hopperdata", "hopper"),
+    "w": ("weatherdata", "weather"),
+}
+
+# Faults that can be injected into the next responses (see inject()).
+FAULTS = ("http_500", "http_503", "invalid_json", "empty", "hang", "disconnect")
+
+
+@dataclass
+class RequestRecord:
+    time: float
+    path: str
+    token: str | None
+    screen: str | None
+    status: int
+    bytes: int
+    fault: str | None = None
+
+
+@dataclass
+class WriteRecord:
+    time: float
+    token: str | None
+    name: str | None
+    menu: str | None
+    value: str | None
+    status: int
+
+
+def load_recording(state: str) -> dict:
+    """Recorded full controllerdata2.php payload (every id of every section) for a boiler state."""
+    with open(RECORDINGS / f"{state}.json", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def recording_names() -> list[str]:
+    return sorted(p.stem for p in RECORDINGS.glob("*.json"))
+
+
+class FakeStokerCloud:
+    """
+    Offline stand-in for stokercloud.dk: controllerdata2.php and updatevalue.php.
+    Every token gets its own boiler, starting from a recorded payload. Reads are cut
+    down to the requested screen query like the real endpoint; writes are logged and
+    applied to the boiler (after apply_delay) so read-after-write can be exercised.
+    """
+
+    def __init__(
+        self,
+        state: str = "running",
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        decimal_comma: bool = True,
+        missing: Iterable[str] = (),
+        error_rate: float = 0.0,
+        error_fault: str = "http_500",
+        apply_delay: float = 0.0,
+        hang: float = 60.0,
+        compress: bool = False,
+        seed: int | None = None,
+    ):
+        self.default_state = state
+        self.latency = latency
+        self.jitter = jitter
+        # False: emit "63.4" instead of the controller's "63,4".
+        self.decimal_comma = decimal_comma
+        # "weatherdata" drops a section, "frontdata/boilertemp" an item, "miscdata/output" a key.
+        self.missing: set[str] = set(missing)
+        self.error_rate = error_rate
+        self.error_fault = error_fault
+        self.apply_delay = apply_delay
+        self.hang = hang
+        # Compress reads when the client accepts it (gzip / deflate), as a proxy or CDN would.
+        self.compress = compress
+        self._random = random.Random(seed)
+        self.boilers: dict[str | None, dict] = {}
+        self._faults: deque[str] = deque()
+        self._write_faults: deque[str] = deque()
+        self.requests: list[RequestRecord] = []
+        self.writes: list[WriteRecord] = []
+        self._runner: web.AppRunner | None = None
+        self.base_url: str | None = None
+
+    # ---- lifecycle ----
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(CONTROLLERDATA_PATH, self._handle_controllerdata)
+        app.router.add_route("*", UPDATE_PATH, self._handle_update)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{bound_host}:{bound_port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> FakeStokerCloud:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    @property
+    def controllerdata_url(self) -> str:
+        return f"{self.base_url}{CONTROLLERDATA_PATH}"
+
+    @property
+    def update_url(self) -> str:
+        return f"{self.base_url}{UPDATE_PATH}"
+
+    # ---- scenario control ----
+
+    def boiler(self, token: str | None) -> dict:
+        if token not in self.boilers:
+            self.boilers[token] = load_recording(self.default_state)
+        return self.boilers[token]
+
+    def set_state(self, token: str | None, state: str) -> None:
+        """Replace a boiler with another recording, e.g. "ignition" or "off"."""
+        self.boilers[token] = load_recording(state)
+
+    def set_value(self, token: str | None, section: str, item_id: str, value: Any) -> None:
+        data = self.boiler(token)
+        if isinstance(data.get(section), list):
+            for item in data[section]:
+                if item.get("id") == item_id:
+                    item["value"] = _controller_str(value)
+                    return
+            data[section].append({"id": item_id, "value": _controller_str(value)})
+        else:
+            data.setdefault(section, {})[item_id] = _controller_str(value)
+
+    def inject(self, fault: str, count: int = 1) -> None:
+        """Make the next `count` controllerdata2.php responses fail with `fault`."""
+        if fault not in FAULTS:
+            raise ValueError(f"Unknown fault {fault}")
+        self._faults.extend([fault] * count)
+
+    def inject_write(self, fault: str, count: int = 1) -> None:
+        """Make the next `count` updatevalue.php responses fail with `fault`."""
+        if fault not in FAULTS:
+            raise ValueError(f"Unknown fault {fault}")
+        self._write_faults.extend([fault] * count)
+
+    def reset_logs(self) -> None:
+        self.requests.clear()
+        self.writes.clear()
+
+    @property
+    def bytes_sent(self) -> int:
+        return sum(r.bytes for r in self.requests)
+
+    # ---- payloads ----
+
+    def render(self, token: str | None, screen: str | None) -> dict:
+        """Payload for one screen query, e.g. "b1,7,b2,12,d1,3"."""
+        data = copy.deepcopy(self.boiler(token))
+        catalog = {section: data.pop(section, []) for section, _prefix in _SCREEN_SECTIONS.values()}
+        for section, _prefix in _SCREEN_SECTIONS.values():
+            data[section] = []
+        for slot, item_id in _parse_screen(screen):
+            section, prefix = _SCREEN_SECTIONS[slot[0]]
+            for item in catalog[section]:
+                if item.get("id") == item_id:
+                    data[section].append({**item, "selection": f"{prefix}{slot[1:]}"})
+                    break
+        for path in self.missing:
+            _drop(data, path.split("/"))
+        if not self.decimal_comma:
+            data = _decimal_point(data)
+        return data
+
+    # ---- handlers ----
+
+    async def _delay(self) -> None:
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _next_fault(self, queue: deque[str]) -> str | None:
+        if queue:
+            return queue.popleft()
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self.error_fault
+        return None
+
+    async def _fault_response(self, request: web.Request, fault: str) -> web.StreamResponse:
+        if fault == "hang":
+            await asyncio.sleep(self.hang)
+        if fault == "disconnect":
+            # Drop the connection without an HTTP response.
+            request.transport.close()
+            return web.Response()
+        if fault == "invalid_json":
+            return web.Response(text="<html>Service unavailable</html>", content_type="text/html")
+        if fault == "empty":
+            return web.json_response({})
+        return web.Response(status=503 if fault == "http_503" else 500)
+
+    async def _handle_controllerdata(self, request: web.Request) -> web.StreamResponse:
+        token = request.query.get("token")
+        screen = request.query.get("screen")
+        await self._delay()
+        if (fault := self._next_fault(self._faults)) is not None:
+            record = RequestRecord(time.time(), request.path, token, screen, 0, 0, fault)
+            self.requests.append(record)
+            resp = await self._fault_response(request, fault)
+            record.status = resp.status
+            return resp
+        body = json.dumps(self.render(token, screen)).encode()
+        self.requests.append(RequestRecord(time.time(), request.path, token, screen, 200, len(body)))
+        resp = web.Response(body=body, content_type="text/html")
+        if self.compress:
+            resp.enable_compression()
+        return resp
+
+    async def _handle_update(self, request: web.Request) -> web.StreamResponse:
+        form = await request.post()
+        params = {**request.query, **form}
+        token, name = params.get("token"), params.get("name")
+        record = WriteRecord(time.time(), token, name, params.get("menu"), params.get("value"), 200)
+        self.writes.append(record)
+        await self._delay()
+        if (fault := self._next_fault(self._write_faults)) is not None:
+            resp = await self._fault_response(request, fault)
+            record.status = resp.status
+            return resp
+        if self.apply_delay > 0:
+            asyncio.get_running_loop().call_later(self.apply_delay, self._apply_write, token, name, record.value)
+        else:
+            self._apply_write(token, name, record.value)
+        return web.json_response({"status": 0})
+
+    def _apply_write(self, token: str | None, name: str | None, value: str | None) -> None:
+        data = self.boiler(token)
+        if name == "boiler.temp":
+            self.set_value(token, "frontdata", "-wantedboilertemp", value)
+        elif name == "hopper.content":
+            self.set_value(token, "frontdata", "hoppercontent", value)
+            self.set_value(token, "hopperdata", "1", value)
+        elif name == "hot_water.diff_under":
+            self.set_value(token, "dhwdata", "3", value)
+        elif name == "misc.start":
+            data["miscdata"].update(running="1", state={"value": "state_2"})
+        elif name == "misc.stop":
+            data["miscdata"].update(running="0", output="0,0", outputpct="0", state={"value": "state_14"})
+
+
+def _parse_screen(screen: str | None) -> Iterator[tuple[str, str]]:
+    parts = (screen or "").split(",")
+    for slot, item_id in zip(parts[::2], parts[1::2]):
+        if slot[:1] in _SCREEN_SECTIONS and item_id != "0":
+            yield slot, item_id
+
+
+def _controller_str(value: Any) -> str:
+    """Format like the controller does: "65", "7,5"."""
+    if value is None:
+        return ""
+    try:
+        number = float(str(value).replace(",", "."))
+    except ValueError:
+        return str(value)
+    return str(int(number)) if number.is_integer() else str(number).replace(".", ",")
+
+
+def _drop(obj: Any, keys: list[str]) -> None:
+    key, rest = keys[0], keys[1:]
+    if isinstance(obj, list):
+        for item in list(obj):
+            if isinstance(item, dict) and item.get("id") == key:
+                if rest:
+                    _drop(item, rest)
+                else:
+                    obj.remove(item)
+    elif isinstance(obj, dict) and key in obj:
+        if rest:
+            _drop(obj[key], rest)
+        else:
+            del obj[key]
+
+
+def _decimal_point(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {k: _decimal_point(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_decimal_point(v) for v in obj]
+    if isinstance(obj, str) and "," in obj and obj.replace(",", "").lstrip("-").isdigit():
+        return obj.replace(",", ".")
+    return obj
+
+
+@contextmanager
+def patch_integration_urls(fake: FakeStokerCloud) -> Iterator[None]:
+    """Point custom_components.stokercloud at the stand-in instead of stokercloud.dk."""
+    from custom_components.stokercloud import api
+
+    saved = api.CONTROLLERDATA_URL, api.UPDATE_URL
+    api.CONTROLLERDATA_URL, api.UPDATE_URL = fake.controllerdata_url, fake.update_url
+    try:
+        yield
+    finally:
+        api.CONTROLLERDATA_URL, api.UPDATE_URL = saved